@@ -1,26 +1,40 @@
+import atexit
 import logging
+import os
 import time
 import threading
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from concurrent.futures import Future
 from queue import Queue
-from typing import Generator
+from typing import Callable, Generator, Optional
 
 from theta_client.file_writer import FileWriter, MinIOConfig
 from theta_client.http_worker import HTTPWorker
 from theta_client.response_processor import ResponseProcessor
-from theta_client.dataframe_collector import DataFrameCollector, DataFrameResult, _SENTINEL
+from theta_client.dataframe_collector import (
+    BatchResult,
+    DataFrameCollector,
+    DataFrameResult,
+    _SENTINEL,
+)
 from theta_client.requests import OptionRequest, StockRequest
-from theta_client.job import FileWriteJob, Job, PipelineCounters
+from theta_client.job import FileWriteJob, Job, PipelineCounters, Schema
 
 Request = OptionRequest | StockRequest
 
 logger = logging.getLogger(__name__)
 
+_LOG_FORMATTER = logging.Formatter(
+    "%(asctime)s | %(name)s | %(levelname)s | %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
 
 class ThetaClient:
     _instance = None
     _lock = threading.Lock()
+    _log_listener: QueueListener | None = None
 
     def __init__(
         self,
@@ -28,19 +42,29 @@ class ThetaClient:
         storage_config: MinIOConfig,
         log_level: str = "INFO",
         timeout: float = 300.0,
+        file_log_level: str = "WARNING",
+        parse_workers: int = 2,
     ):
         """Initialize the ThetaClient.
 
         Args:
-            num_threads: Number of HTTP worker threads to use
-            storage_config: MinIO storage configuration
+            num_threads: Maximum number of concurrent HTTP requests
+            storage_config: MinIO storage configuration. Like timeout, this is
+                locked in by the first constructor call.
             log_level: Log level for theta_client modules. Valid values:
                 "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL".
-                Default is "INFO".
+                Default is "INFO". Like timeout, this is locked in by the first
+                constructor call.
             timeout: Read timeout in seconds for bulk HTTP requests. Default is 300.0.
                 Connect timeout is fixed at 30s. Because ThetaClient is a singleton,
                 this value is locked in by the first constructor call; subsequent
                 calls with a different timeout will log a warning and be ignored.
+            file_log_level: Log level for the rotating log file. Default is "WARNING";
+                set "DEBUG" to capture per-request detail at some logging cost.
+                Locked in by the first constructor call.
+            parse_workers: Number of threads parsing responses concurrently.
+                Default is 2. Like num_threads, this is locked in by the first
+                constructor call.
         """
         if timeout <= 0:
             raise ValueError(f"timeout must be > 0, got {timeout}")
@@ -56,21 +80,52 @@ class ThetaClient:
                     f"ThetaClient already initialized with num_threads={self.num_threads}; "
                     f"ignoring requested num_threads={num_threads}."
                 )
+            if parse_workers != self.parse_workers:
+                logger.warning(
+                    f"ThetaClient already initialized with parse_workers={self.parse_workers}; "
+                    f"ignoring requested parse_workers={parse_workers}."
+                )
+            if log_level != self.log_level:
+                logger.warning(
+                    f"ThetaClient already initialized with log_level={self.log_level}; "
+                    f"ignoring requested log_level={log_level}."
+                )
+            if file_log_level != self.file_log_level:
+                logger.warning(
+                    f"ThetaClient already initialized with file_log_level={self.file_log_level}; "
+                    f"ignoring requested file_log_level={file_log_level}."
+                )
+            if storage_config != self.storage_config:
+                logger.warning(
+                    "ThetaClient already initialized with a different storage_config; "
+                    "ignoring the requested one."
+                )
             return
 
         # Configure logging for theta_client modules
-        self._configure_logging(log_level)
+        self._configure_logging(log_level, file_log_level=file_log_level)
+        self.log_level = log_level
+        self.file_log_level = file_log_level
 
         self.num_threads = num_threads
         self.timeout = timeout
+        self.storage_config = storage_config
+        self.parse_workers = parse_workers
 
         # Initialize workers
         self.file_writer = FileWriter(storage_config)
         self.http_worker = HTTPWorker(num_threads=num_threads, timeout=timeout)
-        self.response_processor = ResponseProcessor()
+        self.response_processor = ResponseProcessor(num_threads=parse_workers)
         self._running = False
         self.http_worker.chain_to(self.response_processor).chain_to(self.file_writer)
 
+        # State for requests pipelined through request_data_async
+        self._pending_futures: list[Future] = []
+        self._async_counters: Optional[PipelineCounters] = None
+        self._async_start_time = 0.0
+        self._async_total_http = 0
+        self._async_total_files = 0
+
         self._initialized = True
 
     # Might want to break this out honestly
@@ -81,6 +136,7 @@ class ThetaClient:
         console: bool = True,
         max_bytes: int = 10 * 1024 * 1024,  # 10MB default
         backup_count: int = 5,
+        file_log_level: str = "WARNING",
     ) -> None:
         """Configure logging for all theta_client modules.
 
@@ -90,15 +146,11 @@ class ThetaClient:
             console: Whether to log to console (default: True)
             max_bytes: Maximum size per log file before rotation (default: 10MB)
             backup_count: Number of backup files to keep (default: 5)
+            file_log_level: Log file level as a string (default: WARNING)
         """
-        # Convert string to logging level, default to INFO if invalid
-        level = getattr(logging, log_level.upper(), None)
-        if level is None:
-            level = logging.INFO
-            logging.warning(
-                f"Invalid log level '{log_level}', defaulting to INFO. "
-                f"Valid levels: DEBUG, INFO, WARNING, ERROR, CRITICAL"
-            )
+        level = self._parse_log_level(log_level, logging.INFO)
+        file_level = self._parse_log_level(file_log_level, logging.WARNING)
+        theta_logger = logging.getLogger("theta_client")
 
         # Create log directory if it doesn't exist
         log_path = Path(log_dir)
@@ -106,41 +158,66 @@ class ThetaClient:
 
         log_file = log_path / "theta-client-debug.log"
 
-        # Get the theta_client root logger
-        theta_logger = logging.getLogger("theta_client")
-        theta_logger.setLevel(
-            logging.DEBUG
-        )  # Set to DEBUG to allow all messages through
+        # Records below every handler's level are dropped before a LogRecord is built
+        theta_logger.setLevel(min(level, file_level))
 
-        # Close and clear existing handlers to avoid duplicates and FD leaks
+        # Close and clear existing handlers to avoid duplicates and FD leaks; the
+        # old listener is flushed first so no queued record is lost
+        self._stop_log_listener()
         for handler in theta_logger.handlers:
             handler.close()
         theta_logger.handlers.clear()
 
-        # Create formatter
-        formatter = logging.Formatter(
-            "%(asctime)s | %(name)s | %(levelname)s | %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-
         # Add console handler with user-specified level
         if console:
             console_handler = logging.StreamHandler()
             console_handler.setLevel(level)
-            console_handler.setFormatter(formatter)
+            console_handler.setFormatter(_LOG_FORMATTER)
             theta_logger.addHandler(console_handler)
 
-        # Add rotating file handler - ALWAYS at WARNING level
+        # Add rotating file handler at the file level (WARNING unless requested)
         file_handler = RotatingFileHandler(
             log_file, maxBytes=max_bytes, backupCount=backup_count
         )
-        file_handler.setLevel(logging.DEBUG)  # File always captures DEBUG+
-        file_handler.setFormatter(formatter)
-        theta_logger.addHandler(file_handler)
+        file_handler.setLevel(file_level)
+        file_handler.setFormatter(_LOG_FORMATTER)
+
+        # Pipeline threads only enqueue records; a listener thread does the file
+        # writes and rotation. Handlers are process-wide, so it runs until exit.
+        log_queue: Queue = Queue(-1)
+        queue_handler = QueueHandler(log_queue)
+        # Records only the console wants are dropped here, before
+        # QueueHandler.prepare formats them on the pipeline thread
+        queue_handler.setLevel(file_level)
+        theta_logger.addHandler(queue_handler)
+        listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        ThetaClient._log_listener = listener
 
         # Prevent propagation to root logger
         theta_logger.propagate = False
 
+    @classmethod
+    def _stop_log_listener(cls) -> None:
+        """Flush and stop the file log listener, if one is running."""
+        if cls._log_listener is not None:
+            cls._log_listener.stop()
+            for handler in cls._log_listener.handlers:
+                handler.close()
+            cls._log_listener = None
+
+    @staticmethod
+    def _parse_log_level(log_level: str, default: int) -> int:
+        """Convert a level name to a logging level, falling back to default if invalid."""
+        level = getattr(logging, log_level.upper(), None)
+        if not isinstance(level, int):
+            logging.warning(
+                f"Invalid log level '{log_level}', defaulting to {logging.getLevelName(default)}. "
+                f"Valid levels: DEBUG, INFO, WARNING, ERROR, CRITICAL"
+            )
+            return default
+        return level
+
     # Singleton to prevent too many requests being sent.
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
@@ -165,26 +242,78 @@ class ThetaClient:
         self.response_processor.stop()
         self.file_writer.stop()
 
+    @staticmethod
+    def _get_key_map(request: Request) -> dict[str, list[str]]:
+        """Return the request's key map with duplicate URLs dropped per file."""
+        # dict.fromkeys dedupes while keeping the original URL order
+        return {
+            object_key: list(dict.fromkeys(url_list))
+            for object_key, url_list in request.get_key_map().items()
+        }
+
+    def _get_files_to_process(self, request: Request) -> list[tuple[str, list[str]]]:
+        """Return the (object_key, url_list) pairs that still need to be written."""
+        key_map = self._get_key_map(request)
+        if request.force_refresh:
+            return list(key_map.items())
+
+        # List existing objects once so the checks below are answered from cache;
+        # anything the listing doesn't cover is checked concurrently.
+        if key_map:
+            self.file_writer.prewarm_existence(os.path.commonprefix(list(key_map)))
+        exists = self.file_writer.files_exist(list(key_map), max_workers=self.num_threads)
+
+        files_to_process = [
+            (object_key, url_list)
+            for object_key, url_list in key_map.items()
+            if not exists[object_key]
+        ]
+        if logger.isEnabledFor(logging.DEBUG):
+            for object_key in key_map.keys() - dict(files_to_process).keys():
+                logger.debug(f"Skipping existing file: {object_key}")
+        return files_to_process
+
+    def _submit_files(
+        self,
+        files_to_process: list[tuple[str, list[str]]],
+        schema: Schema,
+        on_complete: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Create a FileWriteJob per file and enqueue its HTTP jobs."""
+        for object_key, url_list in files_to_process:
+            file_write_job = FileWriteJob(
+                object_key=object_key,
+                total_items=len(url_list),
+                on_complete=on_complete,
+            )
+            logger.debug(f"Creating {len(url_list)} HTTP jobs for file: {object_key}")
+            self.http_worker.add_jobs(
+                [
+                    Job(
+                        url=url,
+                        schema=schema,
+                        csv_buffer=None,
+                        file_write_job=file_write_job,
+                    )
+                    for url in url_list
+                ]
+            )
+
     def request_data(self, request: Request) -> None:
+        # Finish any pipelined requests before reusing the workers
+        if self._pending_futures:
+            self.drain()
+
         self._start()
-        logger.info(f"Processing {type(request).__name__}. Parameters: {request}")
+        # Lazy %-formatting: the request repr is only built if INFO is emitted
+        logger.info("Processing %s. Parameters: %s", type(request).__name__, request)
         start_time = time.time()
-        key_map = request.get_key_map()
         schema = request.get_schema()
 
         # Calculate total HTTP requests and files
-        total_http_requests = 0
-        total_files = 0
-        files_to_process: list[tuple[str, list[str]]] = []
-
-        for object_key, url_list in key_map.items():
-            if not request.force_refresh and self.file_writer.file_exists(object_key):
-                logger.debug(f"Skipping existing file: {object_key}")
-                continue
-            else:
-                files_to_process.append((object_key, url_list))
-                total_http_requests += len(url_list)
-                total_files += 1
+        files_to_process = self._get_files_to_process(request)
+        total_http_requests = sum(len(url_list) for _, url_list in files_to_process)
+        total_files = len(files_to_process)
 
         # Set up checkpoint logging
         counters = PipelineCounters()
@@ -199,33 +328,26 @@ class ThetaClient:
                 counters._notify.wait(timeout=10.0)
                 counters._notify.clear()
                 if not stop_event.is_set():
-                    elapsed = time.time() - start_time
                     logger.info(
-                        f"[{symbol}] HTTP: {counters.http_completed}/{total_http_requests} | "
-                        f"Files: {counters.files_completed}/{total_files} | "
-                        f"Elapsed: {elapsed:.1f}s"
+                        "[%s] HTTP: %d/%d | Files: %d/%d | %.1f MiB | Elapsed: %.1fs",
+                        symbol,
+                        counters.http_completed,
+                        total_http_requests,
+                        counters.files_completed,
+                        total_files,
+                        counters.bytes_completed / (1 << 20),
+                        time.time() - start_time,
                     )
 
-        monitor_thread = threading.Thread(target=log_checkpoints, daemon=True)
-        monitor_thread.start()
+        # Checkpoints are INFO records; skip the thread entirely if they'd be dropped
+        monitor_thread: Optional[threading.Thread] = None
+        if logger.isEnabledFor(logging.INFO):
+            monitor_thread = threading.Thread(target=log_checkpoints, daemon=True)
+            monitor_thread.start()
 
         try:
             # Create jobs for files that need processing
-            for object_key, url_list in files_to_process:
-                file_write_job = FileWriteJob(
-                    object_key=object_key, total_items=len(url_list)
-                )
-                logger.debug(
-                    f"Creating {len(url_list)} HTTP jobs for file: {object_key}"
-                )
-                for url in url_list:
-                    job = Job(
-                        url=url,
-                        schema=schema,
-                        csv_buffer=None,
-                        file_write_job=file_write_job,
-                    )
-                    self.http_worker.add_job(job)
+            self._submit_files(files_to_process, schema)
 
             # Wait for all jobs to flow through the pipeline and complete
             self.http_worker.wait_for_completion()
@@ -243,15 +365,106 @@ class ThetaClient:
             self._stop()
             stop_event.set()
             counters._notify.set()
-            monitor_thread.join(timeout=2.0)
+            if monitor_thread is not None:
+                monitor_thread.join(timeout=2.0)
             self.http_worker.counters = None
             self.file_writer.counters = None
             elapsed = time.time() - start_time
             logger.info(
                 f"[{symbol}] Completed — HTTP: {counters.http_completed}/{total_http_requests} | "
                 f"Files: {counters.files_completed}/{total_files} | "
+                f"{counters.bytes_completed / (1 << 20):.1f} MiB | "
+                f"Elapsed: {elapsed:.1f}s"
+            )
+
+    def request_data_async(self, request: Request) -> Future:
+        """Queue a request's jobs and return without waiting for them to finish.
+
+        Unlike request_data, the pipeline is not drained between requests, so
+        HTTP fetches for one request overlap the parsing and uploads of the
+        previous ones. Call drain() once all requests have been submitted.
+
+        Args:
+            request: The data request to process
+
+        Returns:
+            A Future resolved once every file of the request has been handled
+        """
+        self._start()
+        logger.info("Queueing %s. Parameters: %s", type(request).__name__, request)
+        files_to_process = self._get_files_to_process(request)
+
+        future: Future = Future()
+        if not files_to_process:
+            future.set_result(None)
+            return future
+
+        if self._async_counters is None:
+            self._async_counters = PipelineCounters()
+            self._async_start_time = time.time()
+            self.http_worker.counters = self._async_counters
+            self.file_writer.counters = self._async_counters
+
+        self._async_total_http += sum(len(url_list) for _, url_list in files_to_process)
+        self._async_total_files += len(files_to_process)
+
+        remaining = len(files_to_process)
+        remaining_lock = threading.Lock()
+
+        def file_done() -> None:
+            nonlocal remaining
+            with remaining_lock:
+                remaining -= 1
+                done = remaining == 0
+            if done:
+                future.set_result(None)
+
+        self._pending_futures.append(future)
+        self._submit_files(files_to_process, request.get_schema(), on_complete=file_done)
+        return future
+
+    def drain(self) -> None:
+        """Wait for all requests queued with request_data_async to complete.
+
+        Raises:
+            Exception: The first error raised by a pipeline worker. Futures that
+                had not completed are failed with the same exception.
+        """
+        if not self._pending_futures:
+            return
+
+        counters = self._async_counters
+        try:
+            self.http_worker.wait_for_completion()
+            self.http_worker.check_for_errors()
+            self.response_processor.wait_for_completion()
+            self.response_processor.check_for_errors()
+            self.file_writer.wait_for_completion()
+            self.file_writer.check_for_errors()
+
+        except Exception as e:
+            logger.error(f"Error during job processing: {e}")
+            for future in self._pending_futures:
+                if not future.done():
+                    future.set_exception(e)
+            raise
+
+        finally:
+            self._stop()
+            self.http_worker.counters = None
+            self.file_writer.counters = None
+            elapsed = time.time() - self._async_start_time
+            logger.info(
+                f"Drained {len(self._pending_futures)} requests — "
+                f"HTTP: {counters.http_completed}/{self._async_total_http} | "
+                f"Files: {counters.files_completed}/{self._async_total_files} | "
+                f"{counters.bytes_completed / (1 << 20):.1f} MiB | "
                 f"Elapsed: {elapsed:.1f}s"
             )
+            self._pending_futures = []
+            self._async_counters = None
+            self._async_total_http = 0
+            self._async_total_files = 0
 
     def stream_dataframes(
         self, request: Request
@@ -268,24 +481,47 @@ class ThetaClient:
         Yields:
             DataFrameResult with key and DataFrame (or None if data was missing)
         """
+        yield from self._stream(request, as_dataframes=True)
+
+    def stream_batches(
+        self, request: Request
+    ) -> Generator[BatchResult, None, None]:
+        """Stream data as Arrow record batches instead of writing to MinIO.
+
+        Like stream_dataframes(), but each result holds the record batches as
+        parsed, without building a table or DataFrame. Useful when the data goes
+        straight into another Arrow consumer such as DuckDB or a Parquet writer.
+
+        Args:
+            request: The data request to process
+
+        Yields:
+            BatchResult with key, schema and record batches (both None if data
+            was missing)
+        """
+        yield from self._stream(request, as_dataframes=False)
+
+    def _stream(
+        self, request: Request, as_dataframes: bool
+    ) -> Generator[DataFrameResult | BatchResult, None, None]:
+        """Run the pipeline into a DataFrameCollector and yield its results."""
+        if self._pending_futures:
+            self.drain()
+
+        unit = "DataFrames" if as_dataframes else "Batches"
         self._start()
         logger.info(
-            f"Streaming {type(request).__name__} as DataFrames. Parameters: {request}"
+            "Streaming %s as %s. Parameters: %s", type(request).__name__, unit, request
         )
         start_time = time.time()
 
-        key_map = request.get_key_map()
+        key_map = self._get_key_map(request)
         schema = request.get_schema()
 
         # Always fetch — no MinIO file_exists check for streaming
-        files_to_process: list[tuple[str, list[str]]] = []
-        total_http_requests = 0
-        total_files = 0
-
-        for object_key, url_list in key_map.items():
-            files_to_process.append((object_key, url_list))
-            total_http_requests += len(url_list)
-            total_files += 1
+        files_to_process = list(key_map.items())
+        total_http_requests = sum(map(len, key_map.values()))
+        total_files = len(files_to_process)
 
         # Set up checkpoint logging
         counters = PipelineCounters()
@@ -294,7 +530,9 @@ class ThetaClient:
 
         # Set up DataFrameCollector as the terminal worker
         result_queue: Queue = Queue()
-        collector = DataFrameCollector(result_queue=result_queue)
+        collector = DataFrameCollector(
+            result_queue=result_queue, as_dataframes=as_dataframes
+        )
         collector.counters = counters
 
         # Swap the response_processor chain from file_writer to collector
@@ -309,31 +547,28 @@ class ThetaClient:
                 counters._notify.wait(timeout=30.0)
                 counters._notify.clear()
                 if not stop_event.is_set():
-                    elapsed = time.time() - start_time
                     logger.info(
-                        f"[{symbol}] HTTP: {counters.http_completed}/{total_http_requests} | "
-                        f"DataFrames: {counters.files_completed}/{total_files} | "
-                        f"Elapsed: {elapsed:.1f}s"
+                        "[%s] HTTP: %d/%d | %s: %d/%d | %.1f MiB | Elapsed: %.1fs",
+                        symbol,
+                        counters.http_completed,
+                        total_http_requests,
+                        unit,
+                        counters.files_completed,
+                        total_files,
+                        counters.bytes_completed / (1 << 20),
+                        time.time() - start_time,
                     )
 
-        monitor_thread = threading.Thread(target=log_checkpoints, daemon=True)
-        monitor_thread.start()
+        # Checkpoints are INFO records; skip the thread entirely if they'd be dropped
+        monitor_thread: Optional[threading.Thread] = None
+        if logger.isEnabledFor(logging.INFO):
+            monitor_thread = threading.Thread(target=log_checkpoints, daemon=True)
+            monitor_thread.start()
 
         # Submit all jobs BEFORE starting the waiter thread.
         # Otherwise wait_for_completion() sees 0 unfinished tasks and
         # signals completion immediately.
-        for object_key, url_list in files_to_process:
-            file_write_job = FileWriteJob(
-                object_key=object_key, total_items=len(url_list)
-            )
-            for url in url_list:
-                job = Job(
-                    url=url,
-                    schema=schema,
-                    csv_buffer=None,
-                    file_write_job=file_write_job,
-                )
-                self.http_worker.add_job(job)
+        self._submit_files(files_to_process, schema)
 
         def _wait_and_signal():
             """Background thread: wait for pipeline completion, then signal generator."""
@@ -366,14 +601,19 @@ class ThetaClient:
             self._stop()
             stop_event.set()
             counters._notify.set()
-            monitor_thread.join(timeout=2.0)
+            if monitor_thread is not None:
+                monitor_thread.join(timeout=2.0)
             self.http_worker.counters = None
             collector.counters = None
             elapsed = time.time() - start_time
             logger.info(
                 f"[{symbol}] Completed — HTTP: {counters.http_completed}/{total_http_requests} | "
-                f"DataFrames: {counters.files_completed}/{total_files} | "
+                f"{unit}: {counters.files_completed}/{total_files} | "
+                f"{counters.bytes_completed / (1 << 20):.1f} MiB | "
                 f"Elapsed: {elapsed:.1f}s"
             )
             collector.stop()
             self.response_processor._chained_worker = original_chain
+
+
+atexit.register(ThetaClient._stop_log_listener)
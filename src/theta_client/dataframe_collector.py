@@ -1,9 +1,9 @@
-"""Terminal worker that collects completed jobs as Polars DataFrames."""
+"""Terminal worker that collects completed jobs as Polars DataFrames or Arrow batches."""
 
 import logging
 from dataclasses import dataclass
 from queue import Queue
-from typing import Optional
+from typing import List, Optional
 
 import polars as pl
 import pyarrow as pa
@@ -24,16 +24,28 @@ class DataFrameResult:
     df: Optional[pl.DataFrame]
 
 
+@dataclass(slots=True)
+class BatchResult:
+    """Result yielded by stream_batches() for each logical file."""
+
+    key: str
+    schema: Optional[pa.Schema]
+    batches: Optional[List[pa.RecordBatch]]
+
+
 class DataFrameCollector(QueueWorker):
     """Terminal worker that converts completed jobs into Polars DataFrames.
 
     Puts DataFrameResult objects into an external result_queue that the
-    stream_dataframes() generator reads from.
+    stream_dataframes() generator reads from. With as_dataframes=False it puts
+    BatchResult objects holding the parsed record batches instead, for
+    stream_batches().
     """
 
-    def __init__(self, result_queue: Queue) -> None:
+    def __init__(self, result_queue: Queue, as_dataframes: bool = True) -> None:
         super().__init__(num_threads=1)
         self._result_queue = result_queue
+        self._as_dataframes = as_dataframes
 
     def process(self, job: Job) -> None:
         if not job.file_write_job.completed:
@@ -42,20 +54,35 @@ class DataFrameCollector(QueueWorker):
         key = job.file_write_job.object_key
 
         if job.file_write_job.skipped_items:
-            logger.warning(
-                f"Incomplete items for {key}. Yielding None DataFrame."
-            )
-            self._result_queue.put(DataFrameResult(key=key, df=None))
+            logger.warning(f"Incomplete items for {key}. Yielding a result without data.")
+            if self._as_dataframes:
+                self._result_queue.put(DataFrameResult(key=key, df=None))
+            else:
+                self._result_queue.put(BatchResult(key=key, schema=None, batches=None))
             if self.counters:
                 self.counters.inc_files()
             return
 
-        if job.file_write_job.tables:
-            table = pa.concat_tables(job.file_write_job.tables)
+        if not self._as_dataframes and job.file_write_job.schema is not None:
+            # Handed over as parsed, with no table or DataFrame built
+            batches = job.file_write_job.batches
+            self._result_queue.put(
+                BatchResult(key=key, schema=job.file_write_job.schema, batches=batches)
+            )
+            if self.counters:
+                self.counters.inc_files(sum(batch.nbytes for batch in batches))
+            logger.debug(
+                f"Collected record batches for {key}: "
+                f"{sum(batch.num_rows for batch in batches)} rows"
+            )
+        elif job.file_write_job.schema is not None:
+            table = pa.Table.from_batches(
+                job.file_write_job.batches, schema=job.file_write_job.schema
+            )
             df: pl.DataFrame = pl.from_arrow(table)  # type: ignore[assignment]
             self._result_queue.put(DataFrameResult(key=key, df=df))
             if self.counters:
-                self.counters.inc_files()
+                self.counters.inc_files(table.nbytes)
             logger.debug(
                 f"Collected DataFrame for {key}: {len(df)} rows"
             )
@@ -1,6 +1,11 @@
 import logging
-from io import BytesIO
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Optional
 
 import pyarrow as pa
 import pyarrow.parquet as pq
@@ -26,11 +31,14 @@ class MinIOConfig:
 class FileWriter(QueueWorker):
     """Terminal worker that writes PyArrow tables to MinIO as Parquet files."""
 
-    def __init__(self, config: MinIOConfig) -> None:
+    def __init__(self, config: MinIOConfig, exists_cache_ttl: float = 60.0) -> None:
         """Initialize the file writer.
 
         Args:
             config: MinIO configuration for S3-compatible object storage
+            exists_cache_ttl: Seconds an existence answer, either a prefix listing
+                from prewarm_existence or an object seen to exist, is trusted to
+                answer file_exists without a round trip. Default is 60.
         """
         # FileWriter is a terminal worker - it doesn't output results
         super().__init__(num_threads=1)
@@ -42,9 +50,17 @@ class FileWriter(QueueWorker):
             secure=self.config.secure,
             region="us-east-1",
         )
+        self.exists_cache_ttl = exists_cache_ttl
+        # Object key -> when it was seen to exist, and prefix -> (when it was
+        # listed, keys under it). Kept in time order so expired entries are
+        # popped from the front; the lock covers the worker thread and the
+        # files_exist pool
+        self._cache_lock = threading.Lock()
+        self._exists_cache: OrderedDict[str, float] = OrderedDict()
+        self._listed_prefixes: OrderedDict[str, tuple[float, set[str]]] = OrderedDict()
 
     def process(self, job: Job) -> None:
-        """Write the job's PyArrow tables to MinIO as a Parquet file.
+        """Write the job's record batches to MinIO as a Parquet file.
 
         Args:
             job: The job containing tables to write
@@ -64,16 +80,22 @@ class FileWriter(QueueWorker):
             )
             if self.counters:
                 self.counters.inc_files()
+            if job.file_write_job.on_complete is not None:
+                job.file_write_job.on_complete()
             return
 
-        if job.file_write_job.tables:
-            table = pa.concat_tables(job.file_write_job.tables)
+        if job.file_write_job.schema is not None:
+            # Zero-copy view over the accumulated batches; written as one table so
+            # row groups span responses instead of following CSV block boundaries
+            table = pa.Table.from_batches(
+                job.file_write_job.batches, schema=job.file_write_job.schema
+            )
 
             buffer = BytesIO()
             pq.write_table(table, buffer)
+            size = buffer.tell()
             buffer.seek(0)
 
-            size = len(buffer.getvalue())
             self.minio_client.put_object(
                 bucket_name=self.config.raw_bucket,
                 object_name=job.file_write_job.object_key,
@@ -82,26 +104,144 @@ class FileWriter(QueueWorker):
                 content_type="application/octet-stream",
             )
 
+            self._remember_exists(job.file_write_job.object_key)
+
             logger.debug(
                 f"File writer successfully uploaded object to MinIO: {job.file_write_job.object_key}"
             )
             if self.counters:
-                self.counters.inc_files()
+                self.counters.inc_files(table.nbytes)
+            if job.file_write_job.on_complete is not None:
+                job.file_write_job.on_complete()
+
+    def existing_keys(self, prefix: str) -> Optional[set[str]]:
+        """List the object keys under a prefix across all checked buckets.
+
+        One paginated listing replaces a stat_object round trip per key.
+
+        Args:
+            prefix: Common prefix of the object keys of interest
+
+        Returns:
+            The set of existing object keys, or None if a bucket could not be
+            listed and callers should fall back to file_exists
+        """
+        keys: set[str] = set()
+        buckets = [self.config.raw_bucket] + self.config.check_buckets
+        for bucket in buckets:
+            try:
+                for obj in self.minio_client.list_objects(
+                    bucket, prefix=prefix, recursive=True
+                ):
+                    keys.add(obj.object_name)
+            except S3Error as e:
+                if e.code == "NoSuchBucket":
+                    continue
+                logger.warning(f"Could not list objects in {bucket}/{prefix}: {e}")
+                return None
+        return keys
+
+    def prewarm_existence(self, prefix: str) -> bool:
+        """List a prefix once so file_exists can answer keys under it from cache.
+
+        Args:
+            prefix: Common prefix of the object keys about to be checked
+
+        Returns:
+            True if the listing succeeded and now covers the prefix
+        """
+        keys = self.existing_keys(prefix)
+        if keys is None:
+            return False
+        now = time.monotonic()
+        with self._cache_lock:
+            self._listed_prefixes[prefix] = (now, keys)
+            self._listed_prefixes.move_to_end(prefix)
+            self._prune_expired(now)
+        return True
+
+    def _remember_exists(self, object_key: str) -> None:
+        """Record that an object exists, trusted for exists_cache_ttl seconds."""
+        now = time.monotonic()
+        with self._cache_lock:
+            self._exists_cache[object_key] = now
+            self._exists_cache.move_to_end(object_key)
+            self._prune_expired(now)
+
+    def _prune_expired(self, now: float) -> None:
+        """Drop cache entries older than the TTL. Caller holds _cache_lock."""
+        cutoff = now - self.exists_cache_ttl
+        while self._exists_cache:
+            if next(iter(self._exists_cache.values())) >= cutoff:
+                break
+            self._exists_cache.popitem(last=False)
+        while self._listed_prefixes:
+            listed_at, _ = next(iter(self._listed_prefixes.values()))
+            if listed_at >= cutoff:
+                break
+            self._listed_prefixes.popitem(last=False)
+
+    def _cached_exists(self, object_key: str) -> Optional[bool]:
+        """Answer an existence check from cache, or None if a round trip is needed."""
+        with self._cache_lock:
+            self._prune_expired(time.monotonic())
+            if object_key in self._exists_cache:
+                return True
+            listed = False
+            for prefix, (_, keys) in self._listed_prefixes.items():
+                if object_key.startswith(prefix):
+                    if object_key in keys:
+                        return True
+                    listed = True
+        return False if listed else None
 
     def file_exists(self, object_key: str) -> bool:
         """Check if an object exists in MinIO.
 
+        Answered from the existence cache when possible; otherwise falls back
+        to a stat_object call per bucket.
+
         Args:
             object_key: The object key to check
 
         Returns:
             True if the object exists, False otherwise
         """
+        cached = self._cached_exists(object_key)
+        if cached is not None:
+            return cached
+
         buckets = [self.config.raw_bucket] + self.config.check_buckets
         for bucket in buckets:
             try:
                 self.minio_client.stat_object(bucket, object_key)
+                self._remember_exists(object_key)
                 return True
             except S3Error:
                 continue
         return False
+
+    def files_exist(self, object_keys: list[str], max_workers: int = 4) -> dict[str, bool]:
+        """Check several objects, fanning uncached checks out over a thread pool.
+
+        Args:
+            object_keys: The object keys to check
+            max_workers: Maximum number of concurrent stat_object round trips
+
+        Returns:
+            Mapping of each object key to whether it exists
+        """
+        result: dict[str, bool] = {}
+        uncached: list[str] = []
+        for object_key in object_keys:
+            cached = self._cached_exists(object_key)
+            if cached is None:
+                uncached.append(object_key)
+            else:
+                result[object_key] = cached
+
+        if uncached:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                result.update(zip(uncached, executor.map(self.file_exists, uncached)))
+        return result
+
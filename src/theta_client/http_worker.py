@@ -1,9 +1,11 @@
+import asyncio
 import logging
+import threading
 import time
-from io import BytesIO
 from typing import Optional
 
 import httpx
+import pyarrow as pa
 
 from theta_client.job import Job
 from theta_client.queue_worker import QueueWorker
@@ -12,44 +14,134 @@ logger = logging.getLogger(__name__)
 
 
 class HTTPWorker(QueueWorker):
-    """Worker that fetches data from HTTP endpoints concurrently."""
+    """Worker that fetches data from HTTP endpoints concurrently.
+
+    Requests are issued by fetch tasks on a single asyncio event loop running in
+    a background thread, so the number of in-flight requests is bounded by
+    max_concurrency rather than by the number of OS threads.
+    """
 
     def __init__(
-        self, num_threads: int = 4, max_retries: int = 2, timeout: float = 300.0
+        self,
+        num_threads: int = 4,
+        max_retries: int = 2,
+        timeout: float = 300.0,
+        max_concurrency: Optional[int] = None,
     ) -> None:
         """Initialize the HTTP worker.
 
         Args:
-            num_threads: Number of concurrent HTTP worker threads. Default is 4.
+            num_threads: Number of concurrent HTTP requests, used when
+                max_concurrency is not given. Default is 4.
             max_retries: Max retries for transient errors (5xx, timeouts). Default is 2.
             timeout: Read timeout in seconds for HTTP requests. Default is 300.0.
                 Connect timeout is fixed at 30s.
+            max_concurrency: Maximum number of in-flight requests and pooled
+                connections. Defaults to num_threads.
         """
         if timeout <= 0:
             raise ValueError(f"timeout must be > 0, got {timeout}")
         super().__init__(num_threads=num_threads)
         self.max_retries = max_retries
         self.timeout = timeout
-        self.httpx_client: Optional[httpx.Client] = None
+        self.max_concurrency = max_concurrency or num_threads
+        self.httpx_client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._main_task: Optional[asyncio.Task] = None
+        self._feeding = False
 
     def start(self) -> None:
-        """Start the HTTP worker threads and create a fresh HTTP client."""
-        self.httpx_client = httpx.Client(
+        """Start the event loop thread that issues the HTTP requests."""
+        if self._running:
+            return
+
+        self._running = True
+        self._errors = []
+        logger.debug(
+            f"Starting {self.__class__.__name__} with max_concurrency={self.max_concurrency}."
+        )
+
+        thread = threading.Thread(
+            target=asyncio.run,
+            args=(self._run(),),
+            daemon=True,
+            name=f"{self.__class__.__name__}-loop",
+        )
+        thread.start()
+        self._threads.append(thread)
+
+    async def _run(self) -> None:
+        """Feed jobs from the input queue to max_concurrency fetch tasks."""
+        self._loop = asyncio.get_running_loop()
+        self._main_task = asyncio.current_task()
+        self.httpx_client = httpx.AsyncClient(
             timeout=httpx.Timeout(self.timeout, connect=30.0),
             limits=httpx.Limits(
-                max_connections=self.num_threads,  # Must match server connection limit
-                max_keepalive_connections=self.num_threads,
+                max_connections=self.max_concurrency,  # Must match server connection limit
+                max_keepalive_connections=self.max_concurrency,
             ),
-            transport=httpx.HTTPTransport(retries=0),
-            # Use HTTP/1.1 instead of HTTP/2 to ensure strict concurrency control.
-            # The server enforces a 4 concurrent request limit. HTTP/2 multiplexing
-            # allows multiple streams per connection, which could exceed this limit.
-            # HTTP/1.1 with max_connections=4 guarantees exactly 4 concurrent requests.
+            transport=httpx.AsyncHTTPTransport(retries=0),
+            # The server enforces a 4 concurrent request limit. Concurrency is
+            # capped by the number of fetch tasks below, and the terminal speaks
+            # plain HTTP/1.1, so there is no HTTP/2 multiplexing to opt into.
             http2=False,
         )
-        super().start()
+
+        # Bounded so jobs stay in the thread-safe input queue until a task is free
+        pending: asyncio.Queue[Job] = asyncio.Queue(maxsize=self.max_concurrency)
+        tasks = [
+            asyncio.create_task(self._fetch_loop(pending))
+            for _ in range(self.max_concurrency)
+        ]
+
+        self._feeding = True
+        try:
+            while self._running:
+                # Blocking get on a helper thread; stop() sends a None sentinel
+                job = await asyncio.to_thread(self.input_queue.get)
+                if job is None:
+                    break
+                await pending.put(job)
+        except asyncio.CancelledError:
+            pass  # Cancelled by stop()
+        finally:
+            self._feeding = False
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.httpx_client.aclose()
+            self.httpx_client = None
+
+    async def _fetch_loop(self, pending: "asyncio.Queue[Job]") -> None:
+        """Fetch task: the event loop counterpart of QueueWorker._work."""
+        while True:
+            job = await pending.get()
+            try:
+                processed_job = await self._fetch(job)
+
+                # Forward to chained worker if configured
+                if self._chained_worker is not None and processed_job is not None:
+                    self._chained_worker.add_job(processed_job)
+
+            except Exception as e:
+                # Only records the error; wait_for_completion() then returns and
+                # the caller's stop() cancels the feeder and the other fetch tasks
+                self._record_error(e)
+                return
+            finally:
+                self._task_done()
 
     def process(self, job: Job) -> Optional[Job]:
+        """Not supported: jobs are fetched on the event loop, see _fetch().
+
+        Raises:
+            NotImplementedError: Always. Queue jobs with add_job() instead.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} fetches on its event loop; use add_job()"
+        )
+
+    async def _fetch(self, job: Job) -> Optional[Job]:
         """Fetch data from the HTTP endpoint specified in the job.
 
         Args:
@@ -59,28 +151,36 @@ class HTTPWorker(QueueWorker):
             The job with csv_buffer populated (or None if no data/timeout)
         """
         start_time = time.time()
-        logger.debug(f"Processing job for URL: {job.url}")
+        # Checked once so the per-request debug lines cost nothing when disabled
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug(f"Processing job for URL: {job.url}")
 
         for attempt in range(1 + self.max_retries):
             try:
-                logger.debug(f"Acquiring connection for {job.url}")
-                response = self.httpx_client.get(job.url)
-                logger.debug(f"Connection acquired and request completed for {job.url}")
+                if debug:
+                    logger.debug(f"Acquiring connection for {job.url}")
+                response = await self.httpx_client.get(job.url)
+                if debug:
+                    logger.debug(f"Connection acquired and request completed for {job.url}")
                 duration_ms = (time.time() - start_time) * 1000
 
-                # If no data just return None for the buffer
-                if response.status_code == 472:
-                    response_text = response.text
-                    if "No data found for your request" in response_text:
-                        logger.warning(f"No data response from {job.url} ({duration_ms:.1f}ms)")
-                        job.csv_buffer = None
-                        if self.counters:
-                            self.counters.inc_http()
-                        return job
+                # If no data just return None for the buffer. Matched on the raw
+                # bytes to skip response.text's charset detection and decode.
+                status_code = response.status_code
+                if status_code == 472 and b"No data found for your request" in response.content:
+                    logger.warning(f"No data response from {job.url} ({duration_ms:.1f}ms)")
+                    job.csv_buffer = None
+                    if self.counters:
+                        self.counters.inc_http()
+                    return job
 
-                response.raise_for_status()
-                job.csv_buffer = BytesIO(response.content)
-                logger.debug(f"Processing complete for URL: {job.url} in {duration_ms:.1f}ms")
+                if status_code >= 300:
+                    response.raise_for_status()
+                # Wrap the body without copying; parsed straight from this buffer downstream
+                job.csv_buffer = pa.py_buffer(response.content)
+                if debug:
+                    logger.debug(f"Processing complete for URL: {job.url} in {duration_ms:.1f}ms")
 
                 if self.counters:
                     self.counters.inc_http()
@@ -97,7 +197,7 @@ class HTTPWorker(QueueWorker):
                         f"Attempt {attempt + 1}/{1 + self.max_retries} failed for {job.url}: {e}. "
                         f"Retrying in {delay}s..."
                     )
-                    time.sleep(delay)
+                    await asyncio.sleep(delay)
                 else:
                     duration_ms = (time.time() - start_time) * 1000
                     logger.warning(
@@ -116,9 +216,22 @@ class HTTPWorker(QueueWorker):
                 )
                 raise
 
+    def _cancel_feeder(self, main_task: asyncio.Task) -> None:
+        """Cancel the feeder unless it already left its loop. Runs on the event loop,
+        so it cannot interrupt the cleanup that follows a sentinel shutdown."""
+        if self._feeding:
+            main_task.cancel()
+
     def stop(self) -> None:
-        """Stop the HTTP worker and close the HTTP client."""
+        """Stop the event loop thread; it closes the HTTP client on the way out."""
+        self._running = False
+        loop, main_task = self._loop, self._main_task
+        if loop is not None and main_task is not None:
+            try:
+                # Wake the feeder even if it is blocked handing off a job
+                loop.call_soon_threadsafe(self._cancel_feeder, main_task)
+            except RuntimeError:
+                pass  # Loop already closed
         super().stop()
-        if self.httpx_client is not None:
-            self.httpx_client.close()
-            self.httpx_client = None
+        self._loop = None
+        self._main_task = None
@@ -1,6 +1,7 @@
+import itertools
 import threading
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Callable, Iterator, Optional, List
 from io import BytesIO
 from enum import Enum
 
@@ -29,51 +30,63 @@ class FileWriteJob:
     object_key: str
     total_items: int
     skipped_items: bool = False
-    completed_items: int = 0
     completed: bool = False
-    tables: List[pa.table] = field(default_factory=list)
+    batches: List[pa.RecordBatch] = field(default_factory=list)
+    schema: Optional[pa.Schema] = None
     byte_wrapper: Optional[BytesIO] = None
-    _lock: threading.Lock = field(default_factory=threading.Lock)
+    on_complete: Optional[Callable[[], None]] = None
+    _counter: Iterator[int] = field(default_factory=lambda: itertools.count(1))
 
-    def _increment(self) -> None:
-        self.completed_items += 1
-        if self.completed_items == self.total_items:
+    # No lock: list.extend and count.__next__ are single C calls and therefore
+    # atomic under the GIL, so exactly one caller observes the final count.
+    def _increment(self) -> bool:
+        if next(self._counter) == self.total_items:
             self.completed = True
+            return True
+        return False
 
-    def add_table(self, table: pa.table) -> None:
-        with self._lock:
-            self.tables.append(table)
-            self._increment()
+    def add_batches(self, schema: pa.Schema, batches: List[pa.RecordBatch]) -> bool:
+        """Add one response's parsed record batches.
 
-    def mark_item_skipped(self) -> None:
-        """Mark an item as skipped without adding a table."""
-        with self._lock:
-            self.skipped_items = True
-            self._increment()
+        Returns True for the call that completes the file.
+        """
+        self.schema = schema
+        self.batches.extend(batches)
+        return self._increment()
+
+    def mark_item_skipped(self) -> bool:
+        """Mark an item as skipped without adding a table.
+
+        Returns True for the call that completes the file.
+        """
+        self.skipped_items = True
+        return self._increment()
 
 
 @dataclass(slots=True)
 class Job:
     url: str
     schema: Schema
-    csv_buffer: Optional[BytesIO]
+    csv_buffer: Optional[pa.Buffer]
     file_write_job: FileWriteJob
 
 
 class PipelineCounters:
-    __slots__ = ("http_completed", "files_completed", "_lock", "_notify")
+    __slots__ = ("http_completed", "files_completed", "bytes_completed", "_notify")
 
+    # No lock: each counter has a single writer (the HTTP event loop thread and
+    # the single-threaded terminal worker respectively), and readers only need
+    # an approximate value for progress logging.
     def __init__(self):
         self.http_completed = 0
         self.files_completed = 0
-        self._lock = threading.Lock()
+        self.bytes_completed = 0  # Arrow bytes of the completed files' tables
         self._notify = threading.Event()
 
     def inc_http(self):
-        with self._lock:
-            self.http_completed += 1
+        self.http_completed += 1
 
-    def inc_files(self):
-        with self._lock:
-            self.files_completed += 1
+    def inc_files(self, nbytes: int = 0):
+        self.files_completed += 1
+        self.bytes_completed += nbytes
         self._notify.set()
@@ -3,7 +3,7 @@
 import logging
 import threading
 from abc import ABC, abstractmethod
-from queue import Queue, Empty
+from queue import Empty, SimpleQueue
 from typing import Optional
 
 from theta_client.job import Job, PipelineCounters
@@ -11,6 +11,9 @@ from theta_client.job import Job, PipelineCounters
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of results a worker thread buffers before forwarding them
+FORWARD_BATCH_SIZE = 16
+
 
 class QueueWorker(ABC):
     """Abstract base class for queue-based worker patterns.
@@ -31,32 +34,66 @@ class QueueWorker(ABC):
             outputs_results: Whether this worker outputs results to an output queue.
                 Terminal workers (like FileWriter) should set this to False.
         """
-        self.input_queue: Queue[Job] = Queue()
+        # SimpleQueue has no per-item task bookkeeping; completion is tracked by
+        # _unfinished under _all_done, which is only touched once per job.
+        self.input_queue: SimpleQueue[Job] = SimpleQueue()
+        self._unfinished: int = 0
+        self._all_done = threading.Condition()
         self._running: bool = False
         self.num_threads: int = num_threads
         self.counters: Optional[PipelineCounters] = None
         self._threads: list[threading.Thread] = []
-        self._exception: Optional[Exception] = None
-        self._exception_lock = threading.Lock()
+        # list.append is atomic, so the first failure is always _errors[0]
+        # without a lock around the error slot
+        self._errors: list[Exception] = []
         self._chained_worker: Optional["QueueWorker"] = None
+        # Most jobs a thread takes from the queue per process_batch() call; extra
+        # jobs are only taken if already queued, never waited for
+        self._max_batch: int = 1
 
     @abstractmethod
     def process(self, job: Job) -> Optional[Job]:
         """Process a single job."""
         pass
 
+    def _can_batch(self, job: Job) -> bool:
+        """Whether a job may be taken from the queue alongside others."""
+        return True
+
+    def process_batch(self, jobs: list[Job]) -> list[Optional[Job]]:
+        """Process jobs taken from the queue together. Override to share work across them."""
+        return [self.process(job) for job in jobs]
+
     def add_job(self, job: Job) -> None:
         """Add a job to the input queue"""
+        with self._all_done:
+            self._unfinished += 1
         self.input_queue.put(job)
 
+    def add_jobs(self, jobs: list[Job]) -> None:
+        """Add several jobs to the input queue under a single lock acquisition."""
+        if not jobs:
+            return
+        with self._all_done:
+            self._unfinished += len(jobs)
+        put = self.input_queue.put
+        for job in jobs:
+            put(job)
+
+    def _task_done(self, count: int = 1) -> None:
+        """Mark jobs from the input queue as fully processed."""
+        with self._all_done:
+            self._unfinished -= count
+            if self._unfinished <= 0:
+                self._all_done.notify_all()
+
     def wait_for_completion(self) -> None:
         """Wait for all jobs in the input queue to be processed."""
-        with self.input_queue.all_tasks_done:
-            while self.input_queue.unfinished_tasks:
-                self.input_queue.all_tasks_done.wait(timeout=0.5)
-                with self._exception_lock:
-                    if self._exception is not None:
-                        return
+        with self._all_done:
+            while self._unfinished > 0:
+                self._all_done.wait(timeout=0.5)
+                if self._errors:
+                    return
 
     def chain_to(self, next_worker: "QueueWorker") -> "QueueWorker":
         """Chain this worker's output to another worker's input."""
@@ -65,34 +102,98 @@ class QueueWorker(ABC):
 
     def check_for_errors(self) -> None:
         """Check if any worker thread encountered an exception and raise it."""
-        with self._exception_lock:
-            if self._exception is not None:
-                raise self._exception
+        exception = self._exception
+        if exception is not None:
+            raise exception
+
+    @property
+    def _exception(self) -> Optional[Exception]:
+        """The first exception raised by a worker thread, if any."""
+        errors = self._errors
+        return errors[0] if errors else None
+
+    def _record_error(self, e: Exception) -> None:
+        """Store a worker's exception and stop all workers."""
+        logger.error(f"Error processing job: {e}", exc_info=True)
+        self._errors.append(e)
+        self._running = False
+
+    def _flush(self, forward: list[Job], done: int) -> None:
+        """Forward buffered results, then mark their input jobs done.
+
+        Jobs are only marked done after forwarding, so the chained worker's
+        unfinished count is raised before this worker's can reach zero.
+        """
+        if forward:
+            self._chained_worker.add_jobs(forward)  # type: ignore[union-attr]
+            forward.clear()
+        if done:
+            self._task_done(done)
 
     def _work(self) -> None:
-        """Worker loop that processes jobs from the input queue."""
-        while self._running:
-            try:
-                job = self.input_queue.get(timeout=0.1)
-            except Empty:
-                continue
+        """Worker loop that processes jobs from the input queue.
+
+        Up to _max_batch jobs that are already queued are taken together and
+        handed to process_batch(); taking stops at the first job _can_batch()
+        rejects, so such jobs are not held back from other threads. Results
+        are forwarded to the chained worker in batches of up to
+        FORWARD_BATCH_SIZE, flushed early whenever the input queue runs dry.
+        """
+        forward: list[Job] = []
+        done = 0
+        while True:
+            if done:
+                # Never block while holding results; flush once the queue is empty
+                try:
+                    job = self.input_queue.get_nowait()
+                except Empty:
+                    self._flush(forward, done)
+                    done = 0
+                    continue
+            else:
+                # Blocks without polling; stop() wakes each thread with a None sentinel
+                job = self.input_queue.get()
+            if job is None or not self._running:
+                break
+
+            jobs = [job]
+            stopping = False
+            while len(jobs) < self._max_batch and self._can_batch(jobs[-1]):
+                try:
+                    extra = self.input_queue.get_nowait()
+                except Empty:
+                    break
+                if extra is None:
+                    stopping = True  # Sentinel from stop(); finish this batch first
+                    break
+                # A job that cannot be batched ends the batch. SimpleQueue has no
+                # peek, and putting it back could race clear_queue() in stop()
+                jobs.append(extra)
 
             try:
-                processed_job = self.process(job)
+                if len(jobs) > 1:
+                    processed_jobs = self.process_batch(jobs)
+                else:
+                    processed_jobs = [self.process(jobs[0])]
 
                 # Forward to chained worker if configured
-                if self._chained_worker is not None and processed_job is not None:
-                    self._chained_worker.add_job(processed_job)
+                if self._chained_worker is not None:
+                    forward.extend(job for job in processed_jobs if job is not None)
 
             except Exception as e:
-                logger.error(f"Error processing job: {e}", exc_info=True)
-                with self._exception_lock:
-                    if self._exception is None:  # Store first exception only
-                        self._exception = e
-                self._running = False  # Stop all workers
+                self._record_error(e)
                 break
             finally:
-                self.input_queue.task_done()
+                done += len(jobs)
+
+            if stopping:
+                break
+
+            if len(forward) >= FORWARD_BATCH_SIZE:
+                self._flush(forward, done)
+                done = 0
+
+        self._flush(forward, done)
 
     def start(self) -> None:
         """Start the worker threads."""
@@ -100,7 +201,7 @@ class QueueWorker(ABC):
             return
 
         self._running = True
-        self._exception = None
+        self._errors = []
         logger.debug(
             f"Starting {self.__class__.__name__} with {self.num_threads} worker thread(s)."
         )
@@ -114,22 +215,22 @@ class QueueWorker(ABC):
             thread.start()
             self._threads.append(thread)
 
-    def clear_queue(self, q) -> None:
-        if not q:
-            return
-        while not q.empty():
-            try:
-                q.get_nowait()
-            except:
-                break
+    def clear_queue(self) -> None:
+        """Drop any queued jobs and reset the unfinished count in one step."""
+        with self._all_done:
+            self.input_queue = SimpleQueue()
+            self._unfinished = 0
+            self._all_done.notify_all()
 
     def stop(self) -> None:
         """Stop the worker threads gracefully."""
         logger.debug(f"Stopping {self.__class__.__name__}...")
         self._running = False
 
+        for _ in self._threads:
+            self.input_queue.put(None)  # type: ignore[arg-type]
         for thread in self._threads:
             thread.join(timeout=2.0)
 
         self._threads.clear()
-        self.clear_queue(self.input_queue)
+        self.clear_queue()
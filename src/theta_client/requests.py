@@ -1,21 +1,28 @@
 from typing import List, Dict
 from enum import Enum
 from urllib.parse import urlencode, quote
-from io import StringIO
-from datetime import datetime, timedelta
-from collections import defaultdict
+from datetime import datetime
+from itertools import groupby
 from typing import Dict, List, Optional, Tuple
-import csv
 import logging
+import time
 
 
 import httpx
+import polars as pl
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
 
 from theta_client.job import Schema
 
 
 THETA_BASE_URL = "http://0.0.0.0:25503/v3"
 
+# Trading dates per symbol change at most daily, so repeat requests reuse them
+VALID_DATES_TTL = 3600.0
+_valid_dates_cache: Dict[str, Tuple[float, List[str]]] = {}
+
 logger = logging.getLogger()
 
 class Interval(Enum):
@@ -119,7 +126,6 @@ class ThetaRequest:
         return f"{THETA_BASE_URL}/{self.asset_class.value}/{self.data_type.value}/{self.endpoint.value}"
 
     def _create_urls_per_day(self, days: List[str]) -> List[str]:
-        urls = []
         base_url = self._build_base_url()
 
         base_params = {
@@ -134,69 +140,72 @@ class ThetaRequest:
             base_params["expiration"] = "*"
             base_params["strike"] = "*"
 
-        def quote_keep_star(s, safe, encoding, errors):
-            return quote(s, safe="*")
-
-        for d in days:
-            # Create a string like YYYYMMDD
-            if self.endpoint not in [Endpoint.EOD, Endpoint.GREEKS_EOD] and self.data_type != DataType.AT_TIME:
-                params = base_params | {"date": d}
-            elif self.data_type == DataType.AT_TIME:
-                params = base_params | {"time_of_day": self.time_of_day, "start_date": d, "end_date": d}
-            else:
-                params = base_params | {"start_date": d, "end_date": d}
+        is_at_time = self.data_type == DataType.AT_TIME
+        is_eod = self.endpoint in (Endpoint.EOD, Endpoint.GREEKS_EOD)
+        if is_at_time:
+            base_params["time_of_day"] = self.time_of_day  # type: ignore[assignment]
 
-            urls.append(f"{base_url}?{urlencode(params, quote_via=quote_keep_star)}")  # type: ignore
+        # Encode the shared parameters once; YYYYMMDD dates need no quoting
+        prefix = f"{base_url}?{urlencode(base_params, quote_via=lambda s, *_: quote(s, safe='*'))}"
 
-        return urls
+        if is_eod or is_at_time:
+            return [f"{prefix}&start_date={d}&end_date={d}" for d in days]
+        return [f"{prefix}&date={d}" for d in days]
 
     def get_valid_dates(self) -> List[str]:
+        cached = _valid_dates_cache.get(self.symbol)
+        if cached is not None and time.monotonic() - cached[0] < VALID_DATES_TTL:
+            return list(cached[1])
+
         url = f"{THETA_BASE_URL}/stock/list/dates/quote"
         params = {"symbol": self.symbol}
 
         response = httpx.get(url, params=params)
 
-        if response.status_code == 472:
-            return []
+        # 472 means the symbol has no dates; any other error status raises before
+        # anything is cached, even when its body is empty
+        if response.status_code != 472:
+            response.raise_for_status()
+        if response.status_code == 472 or not response.content.strip():
+            dates = []
+        else:
+            # Parse and filter the whole column in Arrow rather than row by row
+            table = pv.read_csv(
+                pa.BufferReader(response.content),
+                read_options=pv.ReadOptions(use_threads=False),
+                convert_options=pv.ConvertOptions(
+                    include_columns=["date"], column_types={"date": pa.string()}
+                ),
+            )
+            date_strs = pc.replace_substring(table["date"], "-", "")
+            weekday = pc.day_of_week(pc.strptime(date_strs, format="%Y%m%d", unit="s"))
+            # Keep weekdays only (Monday=0 through Friday=4)
+            dates = pc.filter(date_strs, pc.less(weekday, 5)).to_pylist()
 
-        response.raise_for_status()
-        reader = csv.DictReader(StringIO(response.text))
-        dates = []
-        for row in reader:
-            date_str = row["date"].replace("-", "")
-            # Parse date and check if it's a weekday (Monday=0 through Friday=4)
-            dt = datetime.strptime(date_str, "%Y%m%d")
-            if dt.weekday() < 5:  # 0-4 are weekdays, 5-6 are weekend
-                dates.append(date_str)
-        return dates
+        _valid_dates_cache[self.symbol] = (time.monotonic(), dates)
+        return list(dates)
 
     def _generate_date_range(self) -> list[str]:
         # Convert integers to datetime objects
         start = datetime.strptime(str(self.start_date), "%Y%m%d")
         end = datetime.strptime(str(self.end_date), "%Y%m%d")
 
-        # Generate all dates in range
-        dates = []
-        current = start
-        while current <= end:
-            dates.append(current.strftime("%Y%m%d"))
-            current += timedelta(days=1)
-
-        return dates
+        # Generate and format all dates in range in one vectorised pass
+        return (
+            pl.date_range(start, end, interval="1d", eager=True)
+            .dt.strftime("%Y%m%d")
+            .to_list()
+        )
 
     def _map_dates_to_yearmo(
         self, dates: list[str]
     ) -> Dict[Tuple[str, str], List[str]]:
-        yearmo_dict = defaultdict(list)
-
-        for date in dates:
-            year = date[:4]
-            month = date[4:6]
-            day = date[6:]
-            yearmo_key = (year, month)
-            yearmo_dict[yearmo_key].append(date)
-
-        return dict(yearmo_dict)
+        # YYYYMMDD strings sort chronologically, so each month is one contiguous
+        # run; sorted() is linear on the already ordered dates from get_key_map
+        return {
+            (yearmo[:4], yearmo[4:]): list(month_dates)
+            for yearmo, month_dates in groupby(sorted(dates), key=lambda d: d[:6])
+        }
 
     def get_key_map(self) -> Dict[str, List[str]]:
         if self.endpoint in [Endpoint.EOD, Endpoint.GREEKS_EOD, Endpoint.TRADE, Endpoint.TRADE_QUOTE] and self.data_type != DataType.AT_TIME:
@@ -211,20 +220,22 @@ class ThetaRequest:
         base_key = f"{self.minio_folder}/{self.endpoint.value}/{self.file_granularity.value}/{int_str}/{self.symbol}"
         given_dates = self._generate_date_range()
         valid_dates = self.get_valid_dates()
-        final_dates = list(set(valid_dates).intersection(set(given_dates)))
-        day_map = self._map_dates_to_yearmo(final_dates)
+        # Filter in given_dates order so the final dates stay chronological
+        valid_set = set(valid_dates)
+        final_dates = [d for d in given_dates if d in valid_set]
         key_map: Dict[str, List[str]] = {}
         if self.file_granularity == FileGranularity.MONTHLY:
+            day_map = self._map_dates_to_yearmo(final_dates)
             key_map = {
                 f"{base_key}/{k[0]}/{k[1]}/data.parquet": self._create_urls_per_day(v)
                 for k, v in day_map.items()
             }
         elif self.file_granularity == FileGranularity.DAILY:
+            # One file per date; URLs for all dates are built in a single pass
+            urls = self._create_urls_per_day(final_dates)
             key_map = {
-                f"{base_key}/{d[0]}/{d[1]}/{d[2]}/data.parquet": self._create_urls_per_day(
-                    d
-                )
-                for d in day_map.values()
+                f"{base_key}/{d[:4]}/{d[4:6]}/{d[6:]}/data.parquet": [url]
+                for d, url in zip(final_dates, urls)
             }
 
         return key_map
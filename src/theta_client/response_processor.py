@@ -1,7 +1,11 @@
+import re
+import sys
 import time
 import logging
-from typing import Optional
+from types import MappingProxyType
+from typing import List, Mapping, Optional
 
+import pyarrow as pa
 import pyarrow.csv as pv
 
 from theta_client.job import Schema, Job
@@ -10,17 +14,115 @@ from theta_client.queue_worker import QueueWorker
 
 logger = logging.getLogger(__name__)
 
+# Column name -> Arrow type per schema, flattened once at import. Read-only
+# views, since the same mappings back the shared CONVERT_OPTIONS below
+_SCHEMA_TYPE_MAP: Mapping[Schema, Mapping[str, pa.DataType]] = MappingProxyType({
+    schema: MappingProxyType(
+        {sys.intern(field.name): field.type for field in SCHEMAS[schema.value]}
+    )
+    for schema in Schema
+})
+
+
+def _parse_memory_pool() -> pa.MemoryPool:
+    """Return the jemalloc pool if this pyarrow build has it, else the default pool."""
+    try:
+        return pa.jemalloc_memory_pool()
+    except NotImplementedError:
+        return pa.default_memory_pool()
+
+
+# Column buffers for parsed responses come from jemalloc's per-thread arenas,
+# which keeps concurrent parser threads from contending in the allocator
+PARSE_MEMORY_POOL = _parse_memory_pool()
+
+# ConvertOptions are immutable, so one per schema is shared by every job and thread
+CONVERT_OPTIONS: dict[Schema, pv.ConvertOptions] = {
+    schema: pv.ConvertOptions(column_types=column_types)
+    for schema, column_types in _SCHEMA_TYPE_MAP.items()
+}
+
+# Header line of a response whose columns are in schema order, for either line ending
+_SCHEMA_HEADERS: dict[Schema, tuple[pa.Buffer, ...]] = {
+    schema: tuple(
+        pa.py_buffer(",".join(column_types).encode() + ending) for ending in (b"\r\n", b"\n")
+    )
+    for schema, column_types in _SCHEMA_TYPE_MAP.items()
+}
+
+# Most queued jobs a parser thread takes at once. Small responses among them that
+# share a header are parsed in one pass: per-call parser setup costs about as much
+# as parsing a few hundred rows, which is a whole day of minute bars
+COMBINE_MAX_JOBS = 16
+
+# Bytes read from the start of a response to find its header line when grouping
+_HEADER_PROBE_SIZE = 4096
+
+# Searched in response buffers without copying them into bytes
+_QUOTE = re.compile(b'"')
+_NEWLINE = ord("\n")
+
 
 class ResponseProcessor(QueueWorker):
-    """Worker that processes HTTP responses into PyArrow tables."""
+    """Worker that processes HTTP responses into PyArrow record batches."""
 
-    def __init__(self) -> None:
+    def __init__(self, num_threads: int = 2, block_size: int = 1 << 20) -> None:
         """Initialize the response processor.
 
-        This worker is single-threaded by default since PyArrow CSV parsing
-        is already optimized.
+        Args:
+            num_threads: Number of parser threads. Default is 2. pv.read_csv
+                releases the GIL, so responses are parsed concurrently, and
+                process() only reads state that is fixed after __init__.
+            block_size: CSV block size in bytes. With a single parser thread,
+                responses larger than one block are parsed in parallel blocks on
+                Arrow's thread pool. Default is 1 MiB.
         """
-        super().__init__(num_threads=1)
+        if block_size <= 0:
+            raise ValueError(f"block_size must be > 0, got {block_size}")
+        super().__init__(num_threads=num_threads)
+        self._max_batch = COMBINE_MAX_JOBS
+        # A response that fits in one block gains nothing from threading, and with
+        # several parser threads each one parses serially to avoid oversubscription
+        self._block_size = block_size
+        self._read_opts = pv.ReadOptions(
+            use_threads=num_threads == 1, block_size=self._block_size
+        )
+        self._read_opts_small = pv.ReadOptions(use_threads=False, block_size=self._block_size)
+        # When the header matches the schema, columns are named from the schema and
+        # the header row is skipped instead of parsed. Some endpoints order their
+        # columns differently from the schema, and those keep reading the header
+        self._named_read_opts: dict[Schema, tuple[pv.ReadOptions, pv.ReadOptions]] = {
+            schema: tuple(
+                pv.ReadOptions(
+                    use_threads=use_threads,
+                    block_size=self._block_size,
+                    column_names=list(column_types),
+                    skip_rows=1,
+                )
+                for use_threads in (num_threads == 1, False)
+            )
+            for schema, column_types in _SCHEMA_TYPE_MAP.items()
+        }
+
+    def _read_options(self, schema: Schema, buffer: pa.Buffer) -> pv.ReadOptions:
+        """Pick the read options for a response.
+
+        Args:
+            schema: The schema the response is parsed with
+            buffer: The CSV response about to be parsed
+
+        Returns:
+            Threaded options for responses larger than one block, and options that
+            skip the header row when it lists the schema's columns in order
+        """
+        large = buffer.size > self._block_size
+        if any(
+            buffer.size >= header.size and buffer[: header.size].equals(header)
+            for header in _SCHEMA_HEADERS[schema]
+        ):
+            threaded, small = self._named_read_opts[schema]
+            return threaded if large else small
+        return self._read_opts if large else self._read_opts_small
 
     def get_convert_options(self, schema: Schema) -> pv.ConvertOptions:
         """Get PyArrow convert options for this schema.
@@ -31,43 +133,162 @@ class ResponseProcessor(QueueWorker):
         Returns:
             PyArrow ConvertOptions with appropriate column types
         """
-        return pv.ConvertOptions(
-            column_types={field.name: field.type for field in SCHEMAS[schema.value]}
-        )
+        return CONVERT_OPTIONS[schema]
 
     def process(self, job: Job) -> Optional[Job]:
-        """Process HTTP result into PyArrow table.
+        """Process HTTP result into PyArrow record batches.
 
         Args:
             job: The job containing CSV buffer to process
 
         Returns:
-            The job with table added to file_write_job
+            The job if it completed its file_write_job, otherwise None. Only the
+            completing job is forwarded, so the terminal worker sees each file once.
         """
+        # Checked once so timing and log formatting cost nothing when disabled
+        debug = logger.isEnabledFor(logging.DEBUG)
+
         # Handle jobs with no data
         if job.csv_buffer is None:
-            job.file_write_job.mark_item_skipped()
+            completed = job.file_write_job.mark_item_skipped()
+            if debug:
+                logger.debug(
+                    f"Marking item skipped for file write job {job.file_write_job.object_key}"
+                )
+            return job if completed else None
+
+        if debug:
+            start_time = time.perf_counter()
+        # Stream the response as record batches; read_csv would concatenate them
+        # into a table only for FileWriteJob to split it back into batches
+        reader = pv.open_csv(
+            pa.BufferReader(job.csv_buffer),
+            read_options=self._read_options(job.schema, job.csv_buffer),
+            convert_options=CONVERT_OPTIONS[job.schema],
+            memory_pool=PARSE_MEMORY_POOL,
+        )
+        batches = list(reader)
+        # Release the raw response now; the completing job lives on until its file is written
+        job.csv_buffer = None
+
+        if debug:
+            duration_ms = (time.perf_counter() - start_time) * 1000
             logger.debug(
-                f"Marking item skipped for file write job {job.file_write_job.object_key}"
+                f"{job.schema.value} processing completed: "
+                f"{sum(batch.num_rows for batch in batches)} rows in {duration_ms:.1f}ms"
             )
-            return job
+        completed = job.file_write_job.add_batches(reader.schema, batches)
 
-        start_time = time.time()
+        return job if completed else None
 
-        parse_start = time.time()
-        table = pv.read_csv(
-            job.csv_buffer, convert_options=self.get_convert_options(job.schema)
-        )
-        parse_duration_ms = (time.time() - parse_start) * 1000
+    def _can_batch(self, job: Job) -> bool:
+        """Only responses that fit in one block are worth combining; larger ones
+        stay in the queue for another parser thread."""
+        return job.csv_buffer is None or job.csv_buffer.size <= self._block_size
+
+    def process_batch(self, jobs: List[Job]) -> List[Optional[Job]]:
+        """Process several queued jobs, parsing small same-header responses together.
+
+        Args:
+            jobs: Jobs taken from the input queue together
+
+        Returns:
+            One entry per job, as process() would return for it
+        """
+        results: List[Optional[Job]] = []
+        groups: dict[tuple[Schema, bytes], List[Job]] = {}
+        for job in jobs:
+            header = None
+            if job.csv_buffer is not None and self._can_batch(job):
+                # Grouped on a copy of the first line only; whole responses are
+                # copied once a group is known to have more than one member
+                prefix = job.csv_buffer[:_HEADER_PROBE_SIZE].to_pybytes()
+                header_end = prefix.find(b"\n") + 1
+                if header_end:
+                    header = prefix[:header_end]
+            if header is None:
+                results.append(self.process(job))
+            else:
+                groups.setdefault((job.schema, header), []).append(job)
+
+        for (schema, header), members in groups.items():
+            if len(members) == 1:
+                results.append(self.process(members[0]))
+            else:
+                results.extend(self._process_combined(schema, header, members))
+        return results
+
+    def _process_combined(
+        self, schema: Schema, header: bytes, members: List[Job]
+    ) -> List[Optional[Job]]:
+        """Parse responses sharing a header as one CSV and split the rows per job.
 
-        duration_ms = (time.time() - start_time) * 1000
-        row_count = len(table)
+        Args:
+            schema: The schema shared by the responses
+            header: The header line shared by the responses
+            members: Jobs whose responses start with header
+
+        Returns:
+            One entry per member, as process() would return for it
+        """
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            start_time = time.perf_counter()
+
+        results: List[Optional[Job]] = []
+        combined_jobs: List[Job] = []
+        parts = [header]
+        # Where each member's rows start and end in the joined bytes
+        spans = []
+        size = len(header)
+        for job in members:
+            # Views into the response buffers, so the join below is the only copy
+            data = memoryview(job.csv_buffer)
+            # Without quoted fields every newline ends a row, so lines can be
+            # counted to split the combined parse back into responses
+            if _QUOTE.search(data):
+                results.append(self.process(job))
+                continue
+            start = size
+            parts.append(data[len(header) :])
+            size += len(data) - len(header)
+            if len(data) > len(header) and data[-1] != _NEWLINE:
+                parts.append(b"\n")
+                size += 1
+            combined_jobs.append(job)
+            spans.append((start, size))
+
+        if len(combined_jobs) < 2:
+            return results + [self.process(job) for job in combined_jobs]
 
-        logger.debug(
-            f"{job.schema.value} processing completed: "
-            f"{row_count} rows in {duration_ms:.1f}ms "
-            f"(parse: {parse_duration_ms:.1f}ms)"
+        joined = b"".join(parts)
+        row_counts = [joined.count(b"\n", start, end) for start, end in spans]
+        combined = pa.py_buffer(joined)
+        table = pv.read_csv(
+            pa.BufferReader(combined),
+            read_options=self._read_options(schema, combined),
+            convert_options=CONVERT_OPTIONS[schema],
+            memory_pool=PARSE_MEMORY_POOL,
         )
-        job.file_write_job.add_table(table)
+        if table.num_rows != sum(row_counts):
+            # Blank lines are skipped by the parser, so the counts no longer line
+            # up with the rows; fall back to parsing each response on its own
+            return results + [self.process(job) for job in combined_jobs]
 
-        return job
+        if debug:
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            logger.debug(
+                f"{schema.value} processing completed: {len(combined_jobs)} responses, "
+                f"{table.num_rows} rows in {duration_ms:.1f}ms"
+            )
+
+        offset = 0
+        for job, rows in zip(combined_jobs, row_counts):
+            job.csv_buffer = None
+            # Zero-copy slices of the combined table
+            completed = job.file_write_job.add_batches(
+                table.schema, table.slice(offset, rows).to_batches()
+            )
+            offset += rows
+            results.append(job if completed else None)
+        return results
@@ -230,7 +230,7 @@ greek_eod = [
     # Black-Scholes intermediate values
     pa.field("d1", pa.float64()),
     pa.field("d2", pa.float64()),
-    pa.field("dual_delta", pa.string()),  # Delta of underlying
+    pa.field("dual_delta", pa.float64()),  # Delta of underlying
     pa.field("dual_gamma", pa.float64()),  # Gamma of underlying
     # Implied volatility
     pa.field("implied_vol", pa.float64()),
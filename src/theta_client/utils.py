@@ -1,67 +1,134 @@
-import requests
-from io import StringIO
+import asyncio
 import csv
-from typing import List
+import threading
+from typing import List, Optional
 
-import pandas as pd
 import httpx
-
-
-def get_index_tickers(index_name):
-    urls = {
-        "sp500": "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies",
-        "dow": "https://en.wikipedia.org/wiki/Dow_Jones_Industrial_Average",
-        "nasdaq100": "https://en.wikipedia.org/wiki/NASDAQ-100",
-        "russell1000": "https://en.wikipedia.org/wiki/Russell_1000_Index",
-        "sp400": "https://en.wikipedia.org/wiki/List_of_S%26P_400_companies",
-        "sp600": "https://en.wikipedia.org/wiki/List_of_S%26P_600_companies",
-    }
-
-    if index_name not in urls:
+import lxml.html
+import pyarrow as pa
+import pyarrow.csv as pv
+
+# Shared by all helpers so repeated calls reuse pooled keep-alive connections
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> httpx.Client:
+    """Return the module's shared HTTP client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    http2=True,
+                    timeout=60,
+                    follow_redirects=True,
+                    limits=httpx.Limits(max_keepalive_connections=32),
+                )
+    return _client
+
+
+def _table_column(table, names: List[str]) -> Optional[List[str]]:
+    """Return the cells under the first header in names, or None if none match."""
+    rows = table.xpath("./thead/tr | ./tbody/tr | ./tr")
+    if not rows:
+        return None
+    header = [cell.text_content().strip() for cell in rows[0].xpath("./th | ./td")]
+    for name in names:
+        if name in header:
+            idx = header.index(name)
+            column = []
+            for row in rows[1:]:
+                cells = row.xpath("./th | ./td")
+                if len(cells) > idx:
+                    column.append(cells[idx].text_content().strip())
+            return column
+    return None
+
+
+_INDEX_URLS = {
+    "sp500": "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies",
+    "dow": "https://en.wikipedia.org/wiki/Dow_Jones_Industrial_Average",
+    "nasdaq100": "https://en.wikipedia.org/wiki/NASDAQ-100",
+    "russell1000": "https://en.wikipedia.org/wiki/Russell_1000_Index",
+    "sp400": "https://en.wikipedia.org/wiki/List_of_S%26P_400_companies",
+    "sp600": "https://en.wikipedia.org/wiki/List_of_S%26P_600_companies",
+}
+
+# Add headers to avoid 403 error
+_INDEX_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+THETA_SYMBOLS_URL = "http://localhost:25503/v3/option/list/symbols"
+
+
+def _index_url(index_name: str) -> str:
+    if index_name not in _INDEX_URLS:
         raise ValueError(f"Index {index_name} not supported")
+    return _INDEX_URLS[index_name]
 
-    url = urls[index_name]
-
-    # Add headers to avoid 403 error
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-
-    # Use requests to get the page content
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()  # Raise an exception for bad status codes
 
-    # Read HTML tables from the response content
-    tables = pd.read_html(StringIO(response.text))
+def _parse_index_tickers(index_name: str, content: bytes) -> List[str]:
+    """Extract the ticker column from an index's Wikipedia page."""
+    # Walk the HTML tables directly instead of building a DataFrame for each one
+    tables = lxml.html.fromstring(content).xpath("//table")
 
     # Different pages have different structures
     if index_name == "sp500":
-        return tables[0]["Symbol"].tolist()
+        table_index, names = 0, ["Symbol"]
     elif index_name == "dow":
-        return tables[1]["Symbol"].tolist()
+        table_index, names = 1, ["Symbol"]
     elif index_name == "nasdaq100":
-        return tables[4]["Ticker"].tolist()
+        table_index, names = 4, ["Ticker"]
     else:
         # Try common column names
-        for col in ["Symbol", "Ticker", "Stock Symbol"]:
-            if col in tables[0].columns:
-                return tables[0][col].tolist()
+        table_index, names = 0, ["Symbol", "Ticker", "Stock Symbol"]
+
+    # A changed page layout must fail loudly rather than drop the whole index
+    column_names = " or ".join(repr(name) for name in names)
+    if len(tables) <= table_index:
+        raise ValueError(
+            f"Index {index_name}: expected a {column_names} column in table "
+            f"{table_index}, but the page has only {len(tables)} tables"
+        )
+    column = _table_column(tables[table_index], names)
+    if column is None:
+        raise ValueError(
+            f"Index {index_name}: no {column_names} column in table {table_index}"
+        )
+    return column
 
-    return []
+
+def get_index_tickers(index_name):
+    url = _index_url(index_name)
+    response = _get_client().get(url, headers=_INDEX_HEADERS)
+    response.raise_for_status()  # Raise an exception for bad status codes
+    return _parse_index_tickers(index_name, response.content)
 
 
 def _get_list(url: str, params: dict) -> List[str]:
-    response = httpx.get(url, params=params, timeout=60)
+    response = _get_client().get(url, params=params)
     response.raise_for_status()
 
-    # Parse the entire CSV response at once
-    reader = csv.reader(StringIO(response.text))
-    next(reader)  # Skip the header row
+    content = response.content
+    if not content.strip():
+        return []
 
-    # Flatten all rows into a single list
-    results = [field for row in reader for field in row]
+    # Read every column as a string so values like "0005" keep their form
+    header = next(csv.reader([content.split(b"\n", 1)[0].decode()]))
+    table = pv.read_csv(
+        pa.BufferReader(content),
+        convert_options=pv.ConvertOptions(
+            column_types={name.strip(): pa.string() for name in header}
+        ),
+    )
 
-    return results
+    # Flatten all rows into a single list, row by row as in the response
+    if table.num_columns == 1:
+        return table.column(0).to_pylist()
+    columns = [column.to_pylist() for column in table.columns]
+    return [field for row in zip(*columns) for field in row]
 
 
 def get_roots(sec: str = "option") -> List[str]:
@@ -76,24 +143,59 @@ def get_dates(root: str, sec: str = "stock") -> List[str]:
     return _get_list(url, params)
 
 
+def _parse_theta_symbols(content: bytes) -> List[str]:
+    if not content.strip():
+        return []
+
+    # Parsed straight from the response bytes; symbol is read as a string so
+    # tickers such as "NA" are kept rather than treated as nulls
+    table = pv.read_csv(
+        pa.BufferReader(content),
+        convert_options=pv.ConvertOptions(
+            column_types={"symbol": pa.string()}, include_columns=["symbol"]
+        ),
+    )
+    return table.column("symbol").to_pylist()
+
+
 def get_theta_symbols() -> List[str]:
-    url = "http://localhost:25503/v3/option/list/symbols"
-    response = httpx.get(url)
+    response = _get_client().get(THETA_SYMBOLS_URL)
     response.raise_for_status()
+    return _parse_theta_symbols(response.content)
+
+
+async def _fetch_symbol_lists(index_names: List[str]) -> List[List[str]]:
+    """Fetch each index's tickers and the Theta symbols concurrently.
+
+    Returns:
+        One ticker list per index name, followed by the Theta symbol list
+    """
+    async with httpx.AsyncClient(http2=True, timeout=60, follow_redirects=True) as client:
 
-    reader = csv.DictReader(StringIO(response.text))
-    return [row["symbol"] for row in reader]
+        async def fetch_index(index_name: str) -> List[str]:
+            response = await client.get(_index_url(index_name), headers=_INDEX_HEADERS)
+            response.raise_for_status()
+            return _parse_index_tickers(index_name, response.content)
+
+        async def fetch_theta() -> List[str]:
+            response = await client.get(THETA_SYMBOLS_URL)
+            response.raise_for_status()
+            return _parse_theta_symbols(response.content)
+
+        return await asyncio.gather(*map(fetch_index, index_names), fetch_theta())
 
 
 def get_symbol_universe(index: str = "all") -> List[str]:
-    if index != "all":
-        idx_tx = get_index_tickers(index)
+    index_names = [index] if index != "all" else ["sp500", "russell1000", "sp600", "sp400"]
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # No loop running in this thread: issue all requests at once
+        *index_lists, theta = asyncio.run(_fetch_symbol_lists(index_names))
     else:
-        sp500 = get_index_tickers("sp500")
-        rut1k = get_index_tickers("russell1000")
-        sp600 = get_index_tickers("sp600")
-        sp400 = get_index_tickers("sp400")
-        idx_tx = sp500 + rut1k + sp600 + sp400
-    theta = get_theta_symbols()
-
-    return list(set(idx_tx).intersection(set(theta)))
+        # Called from async code (e.g. a notebook), where asyncio.run is not allowed
+        index_lists = [get_index_tickers(name) for name in index_names]
+        theta = get_theta_symbols()
+
+    return list(set().union(*index_lists).intersection(theta))
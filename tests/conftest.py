@@ -0,0 +1,132 @@
+"""Shared fixtures: a local fake Theta terminal and an in-memory MinIO."""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterator
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from minio import S3Error
+
+from theta_client import file_writer, requests
+
+QUOTE_HEADER = (
+    "timestamp,bid_size,bid_exchange,bid,bid_condition,"
+    "ask_size,ask_exchange,ask,ask_condition"
+)
+
+# (status, body) for a request path and its query parameters
+Route = Callable[[str, dict[str, str]], tuple[int, bytes]]
+
+
+def quote_rows(date: str, count: int = 5) -> bytes:
+    """A stock quote response for a YYYYMMDD date."""
+    iso = f"{date[:4]}-{date[4:6]}-{date[6:]}"
+    rows = "".join(
+        f"{iso}T09:30:{i:02d}.000,{i},1,187.10,0,2,1,187.20,0\r\n" for i in range(count)
+    )
+    return f"{QUOTE_HEADER}\r\n{rows}".encode()
+
+
+class FakeTheta:
+    """Threaded HTTP server answering Theta terminal paths from routes."""
+
+    def __init__(self) -> None:
+        self.routes: dict[str, Route] = {}
+        self.delay = 0.0
+        self.requests: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                with fake._lock:
+                    fake.requests.append(self.path)
+                    fake.in_flight += 1
+                    fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+                try:
+                    time.sleep(fake.delay)
+                    parts = urlsplit(self.path)
+                    query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+                    route = fake.routes.get(parts.path)
+                    status, body = route(parts.path, query) if route else (404, b"")
+                    self.send_response(status)
+                    self.send_header("Content-Type", "text/csv")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with fake._lock:
+                        fake.in_flight -= 1
+
+        return Handler
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def fake_theta(monkeypatch: pytest.MonkeyPatch) -> Iterator[FakeTheta]:
+    server = FakeTheta()
+    server.start()
+    monkeypatch.setattr(requests, "THETA_BASE_URL", f"{server.url}/v3")
+    requests._valid_dates_cache.clear()
+    yield server
+    server.close()
+    requests._valid_dates_cache.clear()
+
+
+class FakeMinio:
+    """In-memory stand-in for minio.Minio covering the calls FileWriter makes."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        self.objects: dict[tuple[str, str], bytes] = {}
+
+    def stat_object(self, bucket_name: str, object_name: str) -> object:
+        if (bucket_name, object_name) not in self.objects:
+            raise S3Error("NoSuchKey", "not found", "resource", "request", "host", None)
+        return object()
+
+    def list_objects(self, bucket_name: str, prefix: str = "", recursive: bool = False):
+        for bucket, name in list(self.objects):
+            if bucket == bucket_name and name.startswith(prefix):
+                yield type("Object", (), {"object_name": name})()
+
+    def put_object(self, bucket_name: str, object_name: str, data, length: int, **kwargs):
+        self.objects[(bucket_name, object_name)] = data.read(length)
+
+
+@pytest.fixture
+def fake_minio(monkeypatch: pytest.MonkeyPatch) -> type[FakeMinio]:
+    monkeypatch.setattr(file_writer, "Minio", FakeMinio)
+    return FakeMinio
+
+
+def finishes_within(seconds: float, fn: Callable[[], object]) -> bool:
+    """Run fn on a helper thread and report whether it returned in time."""
+    thread = threading.Thread(target=fn, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    return not thread.is_alive()
@@ -0,0 +1,101 @@
+"""Tests for pipelining requests through ThetaClient.request_data_async()."""
+
+from typing import Iterator
+
+import httpx
+import pytest
+from conftest import FakeMinio, FakeTheta, quote_rows
+
+from theta_client.client import MinIOConfig, ThetaClient
+from theta_client.requests import DataType, Endpoint, Interval, StockRequest
+
+FEBRUARY_DATES = ["2024-02-01", "2024-02-02", "2024-02-05", "2024-02-06"]
+
+
+@pytest.fixture
+def theta(fake_theta: FakeTheta) -> FakeTheta:
+    def dates(path: str, query: dict[str, str]) -> tuple[int, bytes]:
+        return 200, ("date\r\n" + "".join(f"{d}\r\n" for d in FEBRUARY_DATES)).encode()
+
+    def quotes(path: str, query: dict[str, str]) -> tuple[int, bytes]:
+        if query["symbol"] == "BAD":
+            return 404, b"unknown symbol"
+        return 200, quote_rows(query["date"])
+
+    fake_theta.routes["/v3/stock/list/dates/quote"] = dates
+    fake_theta.routes["/v3/stock/history/quote"] = quotes
+    return fake_theta
+
+
+@pytest.fixture
+def client(
+    theta: FakeTheta,
+    fake_minio: type[FakeMinio],
+    tmp_path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[ThetaClient]:
+    # Log files go to ./logs, and the singleton is rebuilt for every test
+    monkeypatch.chdir(tmp_path)
+    ThetaClient._instance = None
+    client = ThetaClient(num_threads=2, storage_config=MinIOConfig(), log_level="ERROR")
+    yield client
+    client._stop()
+    ThetaClient._stop_log_listener()
+    ThetaClient._instance = None
+
+
+def _request(symbol: str) -> StockRequest:
+    return StockRequest(
+        symbol=symbol,
+        start_date=20240201,
+        end_date=20240229,
+        data_type=DataType.HISTORY,
+        endpoint=Endpoint.QUOTE,
+        interval=Interval.M1,
+    )
+
+
+def _stored(client: ThetaClient) -> list[str]:
+    return sorted(name for _, name in client.file_writer.minio_client.objects)
+
+
+def test_futures_resolve_for_every_request(client: ThetaClient):
+    futures = [client.request_data_async(_request(s)) for s in ("AAPL", "MSFT", "SPY")]
+    client.drain()
+
+    assert all(future.done() and future.exception() is None for future in futures)
+    assert _stored(client) == [
+        f"thetadata/stock/history/quote/monthly/1m/{s}/2024/02/data.parquet"
+        for s in ("AAPL", "MSFT", "SPY")
+    ]
+    assert client._pending_futures == []
+
+
+def test_http_error_reaches_drain_and_the_pending_futures(client: ThetaClient):
+    good = client.request_data_async(_request("AAPL"))
+    bad = client.request_data_async(_request("BAD"))
+
+    with pytest.raises(httpx.HTTPStatusError) as raised:
+        client.drain()
+
+    assert bad.exception(timeout=0) is raised.value
+    assert good.done()
+    assert client._pending_futures == []
+
+
+def test_request_data_drains_pending_async_requests_first(
+    client: ThetaClient, monkeypatch: pytest.MonkeyPatch
+):
+    calls = []
+    drain = client.drain
+    monkeypatch.setattr(client, "drain", lambda: calls.append("drain") or drain())
+
+    future = client.request_data_async(_request("AAPL"))
+    client.request_data(_request("MSFT"))
+
+    assert calls == ["drain"]
+    assert future.done() and future.exception() is None
+    assert _stored(client) == [
+        "thetadata/stock/history/quote/monthly/1m/AAPL/2024/02/data.parquet",
+        "thetadata/stock/history/quote/monthly/1m/MSFT/2024/02/data.parquet",
+    ]
@@ -0,0 +1,69 @@
+"""Tests for the FileWriter existence cache."""
+
+import pytest
+
+from theta_client import file_writer
+from theta_client.file_writer import FileWriter, MinIOConfig
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(file_writer.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def writer(monkeypatch: pytest.MonkeyPatch) -> FileWriter:
+    writer = FileWriter(MinIOConfig(), exists_cache_ttl=60.0)
+    listings = {"AAPL/": {"AAPL/2024/01/data.parquet"}, "MSFT/": set()}
+    monkeypatch.setattr(writer, "existing_keys", lambda prefix: listings[prefix])
+    return writer
+
+
+def test_prefix_listing_answers_until_it_expires(writer: FileWriter, clock: _Clock):
+    assert writer.prewarm_existence("AAPL/")
+
+    assert writer._cached_exists("AAPL/2024/01/data.parquet") is True
+    assert writer._cached_exists("AAPL/2024/02/data.parquet") is False
+    assert writer._cached_exists("MSFT/2024/01/data.parquet") is None
+
+    clock.now += 61.0
+    assert writer._cached_exists("AAPL/2024/01/data.parquet") is None
+    assert not writer._listed_prefixes
+
+
+def test_expired_prefixes_are_dropped_on_insert(writer: FileWriter, clock: _Clock):
+    writer.prewarm_existence("AAPL/")
+    clock.now += 61.0
+    writer.prewarm_existence("MSFT/")
+
+    assert list(writer._listed_prefixes) == ["MSFT/"]
+
+
+def test_known_objects_expire(writer: FileWriter, clock: _Clock):
+    writer._remember_exists("AAPL/2024/03/data.parquet")
+    assert writer._cached_exists("AAPL/2024/03/data.parquet") is True
+
+    clock.now += 61.0
+    assert writer._cached_exists("AAPL/2024/03/data.parquet") is None
+    assert not writer._exists_cache
+
+
+def test_refreshing_an_object_keeps_it(writer: FileWriter, clock: _Clock):
+    writer._remember_exists("AAPL/2024/03/data.parquet")
+    clock.now += 40.0
+    writer._remember_exists("AAPL/2024/04/data.parquet")
+    writer._remember_exists("AAPL/2024/03/data.parquet")
+    clock.now += 40.0
+
+    assert writer._cached_exists("AAPL/2024/03/data.parquet") is True
+    assert writer._cached_exists("AAPL/2024/04/data.parquet") is True
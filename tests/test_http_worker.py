@@ -0,0 +1,97 @@
+"""Tests for the asyncio-based HTTPWorker against a local fake server."""
+
+import threading
+
+import httpx
+import pytest
+from conftest import FakeTheta, finishes_within, quote_rows
+
+from theta_client.http_worker import HTTPWorker
+from theta_client.job import FileWriteJob, Job, Schema
+
+
+def _jobs(server: FakeTheta, count: int, path: str = "/v3/stock/history/quote") -> list[Job]:
+    file_write_job = FileWriteJob(object_key="key", total_items=count)
+    return [
+        Job(
+            url=f"{server.url}{path}?date=202401{day:02d}",
+            schema=Schema.STOCK_QUOTE,
+            csv_buffer=None,
+            file_write_job=file_write_job,
+        )
+        for day in range(1, count + 1)
+    ]
+
+
+@pytest.fixture
+def quote_server(fake_theta: FakeTheta) -> FakeTheta:
+    fake_theta.routes["/v3/stock/history/quote"] = lambda path, query: (
+        200,
+        quote_rows(query["date"]),
+    )
+    return fake_theta
+
+
+def test_in_flight_requests_never_exceed_max_concurrency(quote_server: FakeTheta):
+    quote_server.delay = 0.05
+    worker = HTTPWorker(max_concurrency=3)
+    jobs = _jobs(quote_server, 12)
+
+    worker.start()
+    try:
+        worker.add_jobs(jobs)
+        assert finishes_within(10.0, worker.wait_for_completion)
+        worker.check_for_errors()
+    finally:
+        worker.stop()
+
+    assert quote_server.max_in_flight == 3
+    assert len(quote_server.requests) == 12
+    assert all(job.csv_buffer is not None for job in jobs)
+
+
+def test_http_error_surfaces_after_wait_for_completion(quote_server: FakeTheta):
+    worker = HTTPWorker(max_concurrency=2)
+
+    worker.start()
+    try:
+        worker.add_jobs(_jobs(quote_server, 3, path="/v3/stock/history/missing"))
+        assert finishes_within(10.0, worker.wait_for_completion)
+        with pytest.raises(httpx.HTTPStatusError):
+            worker.check_for_errors()
+    finally:
+        worker.stop()
+
+
+def test_stop_then_restart_neither_hangs_nor_leaks_threads(quote_server: FakeTheta):
+    threads_before = set(threading.enumerate())
+    quote_server.delay = 0.2
+    worker = HTTPWorker(max_concurrency=2)
+
+    # Stop while requests are in flight and more jobs are queued
+    worker.start()
+    worker.add_jobs(_jobs(quote_server, 6))
+    assert finishes_within(10.0, worker.stop)
+
+    quote_server.delay = 0.0
+    worker.start()
+    try:
+        jobs = _jobs(quote_server, 4)
+        worker.add_jobs(jobs)
+        assert finishes_within(10.0, worker.wait_for_completion)
+        worker.check_for_errors()
+        assert all(job.csv_buffer is not None for job in jobs)
+    finally:
+        assert finishes_within(10.0, worker.stop)
+
+    leaked = [
+        thread
+        for thread in set(threading.enumerate()) - threads_before
+        if "process_request_thread" not in thread.name  # Fake server handlers
+    ]
+    assert leaked == []
+
+
+def test_process_is_not_callable_synchronously():
+    with pytest.raises(NotImplementedError):
+        HTTPWorker().process(None)  # type: ignore[arg-type]
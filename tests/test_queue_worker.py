@@ -0,0 +1,112 @@
+"""Tests for QueueWorker's sentinel shutdown, completion counting and forwarding."""
+
+import threading
+from typing import Optional
+
+import pytest
+from conftest import finishes_within
+
+from theta_client.job import FileWriteJob, Job, Schema
+from theta_client.queue_worker import FORWARD_BATCH_SIZE, QueueWorker
+
+
+class _Echo(QueueWorker):
+    """Forwards every job unchanged, failing on jobs whose url is "fail"."""
+
+    def process(self, job: Job) -> Optional[Job]:
+        if job.url == "fail":
+            raise ValueError("bad job")
+        return job
+
+
+class _Sink(QueueWorker):
+    """Terminal worker that records what it receives."""
+
+    def __init__(self) -> None:
+        super().__init__(num_threads=1)
+        self.received: list[Job] = []
+        self.add_jobs_sizes: list[int] = []
+
+    def add_jobs(self, jobs: list[Job]) -> None:
+        self.add_jobs_sizes.append(len(jobs))
+        super().add_jobs(jobs)
+
+    def process(self, job: Job) -> None:
+        self.received.append(job)
+
+
+def _jobs(count: int, url: str = "ok") -> list[Job]:
+    file_write_job = FileWriteJob(object_key="key", total_items=count)
+    return [Job(url, Schema.STOCK_QUOTE, None, file_write_job) for _ in range(count)]
+
+
+def test_stop_wakes_blocked_threads_with_sentinels():
+    worker = _Echo(num_threads=3)
+    worker.start()
+    threads = list(worker._threads)
+
+    # Every thread is blocked on an empty queue; each sentinel wakes one
+    assert finishes_within(5.0, worker.stop)
+    assert not any(thread.is_alive() for thread in threads)
+
+
+def test_unfinished_count_reaches_zero_across_a_chain():
+    echo, sink = _Echo(num_threads=2), _Sink()
+    echo.chain_to(sink)
+    echo.start()
+    sink.start()
+    try:
+        jobs = _jobs(100)
+        echo.add_jobs(jobs)
+        assert finishes_within(5.0, echo.wait_for_completion)
+        assert finishes_within(5.0, sink.wait_for_completion)
+    finally:
+        echo.stop()
+        sink.stop()
+
+    assert echo._unfinished == 0
+    assert sink._unfinished == 0
+    assert sorted(map(id, sink.received)) == sorted(map(id, jobs))
+
+
+def test_results_are_forwarded_in_batches():
+    echo, sink = _Echo(num_threads=1), _Sink()
+    echo.chain_to(sink)
+
+    # Run one worker loop inline over a full queue, ending on a sentinel
+    echo._running = True
+    echo.add_jobs(_jobs(2 * FORWARD_BATCH_SIZE + 3))
+    echo.input_queue.put(None)  # type: ignore[arg-type]
+    echo._work()
+
+    assert sink.add_jobs_sizes == [FORWARD_BATCH_SIZE, FORWARD_BATCH_SIZE, 3]
+    assert echo._unfinished == 0
+    assert sink._unfinished == 2 * FORWARD_BATCH_SIZE + 3
+
+
+def test_partial_batch_is_flushed_when_the_queue_runs_dry():
+    echo, sink = _Echo(num_threads=1), _Sink()
+    echo.chain_to(sink)
+    forwarded = threading.Event()
+    sink.process = lambda job: forwarded.set()  # type: ignore[method-assign]
+    echo.start()
+    sink.start()
+    try:
+        echo.add_jobs(_jobs(2))
+        # Far fewer than FORWARD_BATCH_SIZE, and no more jobs are coming
+        assert forwarded.wait(5.0)
+    finally:
+        echo.stop()
+        sink.stop()
+
+
+def test_error_ends_wait_and_is_raised():
+    worker = _Echo(num_threads=1)
+    worker.start()
+    try:
+        worker.add_jobs(_jobs(1, url="fail") + _jobs(5))
+        assert finishes_within(5.0, worker.wait_for_completion)
+        with pytest.raises(ValueError, match="bad job"):
+            worker.check_for_errors()
+    finally:
+        worker.stop()
@@ -0,0 +1,144 @@
+"""Tests for request key maps and the valid trading dates behind them."""
+
+import httpx
+import pytest
+from conftest import FakeTheta
+
+from theta_client import requests
+from theta_client.requests import (
+    DataType,
+    Endpoint,
+    FileGranularity,
+    Interval,
+    StockRequest,
+)
+
+
+def _dates_csv(*dates: str) -> bytes:
+    return ("date\r\n" + "".join(f"{d}\r\n" for d in dates)).encode()
+
+
+@pytest.fixture
+def theta(fake_theta: FakeTheta) -> FakeTheta:
+    fake_theta.routes["/v3/stock/list/dates/quote"] = lambda path, query: (
+        200,
+        _dates_csv(
+            "2024-02-01", "2024-02-02", "2024-02-05", "2024-02-06", "2024-02-07"
+        ),
+    )
+    return fake_theta
+
+
+def _request(**overrides) -> StockRequest:
+    params = dict(
+        symbol="AAPL",
+        start_date=20240201,
+        end_date=20240207,
+        data_type=DataType.HISTORY,
+        endpoint=Endpoint.QUOTE,
+        interval=Interval.M1,
+    )
+    params.update(overrides)
+    return StockRequest(**params)
+
+
+def test_daily_key_map_has_one_file_per_date(theta: FakeTheta):
+    key_map = _request(file_granularity=FileGranularity.DAILY).get_key_map()
+
+    base = "thetadata/stock/history/quote/daily/1m/AAPL"
+    days = ["01", "02", "05", "06", "07"]
+    assert list(key_map) == [f"{base}/2024/02/{day}/data.parquet" for day in days]
+    for day, urls in zip(days, key_map.values()):
+        assert len(urls) == 1
+        assert urls[0].endswith(f"&date=202402{day}")
+
+
+def test_monthly_key_map_has_one_url_per_date(theta: FakeTheta):
+    key_map = _request(start_date=20240101, end_date=20240229).get_key_map()
+
+    [(key, urls)] = key_map.items()
+    assert key == "thetadata/stock/history/quote/monthly/1m/AAPL/2024/02/data.parquet"
+    assert len(urls) == 5
+
+
+def test_valid_dates_are_cached_per_symbol(theta: FakeTheta):
+    first = _request().get_valid_dates()
+    assert _request(endpoint=Endpoint.EOD).get_valid_dates() == first
+    assert len(theta.requests) == 1
+
+    _request(symbol="MSFT").get_valid_dates()
+    assert len(theta.requests) == 2
+
+
+def test_cached_valid_dates_expire(theta: FakeTheta, monkeypatch: pytest.MonkeyPatch):
+    _request().get_valid_dates()
+    now = requests.time.monotonic() + requests.VALID_DATES_TTL + 1
+    monkeypatch.setattr(requests.time, "monotonic", lambda: now)
+
+    _request().get_valid_dates()
+    assert len(theta.requests) == 2
+
+
+def test_cached_valid_dates_cannot_be_mutated_by_callers(theta: FakeTheta):
+    _request().get_valid_dates().clear()
+
+    assert len(_request().get_valid_dates()) == 5
+
+
+def _answer(server: FakeTheta, status: int, body: bytes) -> None:
+    server.routes["/v3/stock/list/dates/quote"] = lambda path, query: (status, body)
+
+
+def test_valid_dates_keep_weekdays_only(fake_theta: FakeTheta):
+    # Saturday 2024-02-03 and Sunday 2024-02-04 are dropped
+    weekend = _dates_csv("2024-02-02", "2024-02-03", "2024-02-04", "2024-02-05")
+    _answer(fake_theta, 200, weekend)
+
+    assert _request().get_valid_dates() == ["20240202", "20240205"]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"date\r\n2024-02-01\r\n2024-02-02\r\n",
+        b"date\n2024-02-01\n2024-02-02\n",
+        b"date\r\n2024-02-01\r\n2024-02-02",
+    ],
+    ids=["crlf", "lf", "no_final_newline"],
+)
+def test_valid_dates_parse_any_line_ending(fake_theta: FakeTheta, body: bytes):
+    _answer(fake_theta, 200, body)
+
+    assert _request().get_valid_dates() == ["20240201", "20240202"]
+
+
+@pytest.mark.parametrize(
+    "status, body",
+    [
+        (200, b""),
+        (200, b"\r\n"),
+        (200, b"date\r\n"),
+        (472, b"No data found for your request"),
+    ],
+    ids=["empty", "blank", "header_only", "no_data"],
+)
+def test_valid_dates_without_rows_are_empty(
+    fake_theta: FakeTheta, status: int, body: bytes
+):
+    _answer(fake_theta, status, body)
+
+    assert _request().get_valid_dates() == []
+    assert _request().get_valid_dates() == []
+    assert len(fake_theta.requests) == 1
+
+
+def test_error_status_raises_even_with_an_empty_body(fake_theta: FakeTheta):
+    _answer(fake_theta, 503, b"")
+
+    with pytest.raises(httpx.HTTPStatusError):
+        _request().get_valid_dates()
+
+    # The failure is not cached, so the next lookup asks again
+    _answer(fake_theta, 200, _dates_csv("2024-02-01"))
+    assert _request().get_valid_dates() == ["20240201"]
+    assert len(fake_theta.requests) == 2
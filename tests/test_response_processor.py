@@ -0,0 +1,121 @@
+"""Tests for combining small responses in ResponseProcessor.process_batch()."""
+
+import pyarrow as pa
+
+from theta_client.job import FileWriteJob, Job, Schema
+from theta_client.response_processor import ResponseProcessor
+
+QUOTE_HEADER = (
+    "timestamp,bid_size,bid_exchange,bid,bid_condition,"
+    "ask_size,ask_exchange,ask,ask_condition"
+)
+
+
+def _quote_csv(
+    bid_sizes: list[int],
+    newline: str = "\r\n",
+    final_newline: bool = True,
+    header: str = QUOTE_HEADER,
+) -> bytes:
+    """Build a stock quote response whose rows are told apart by bid_size."""
+    rows = [
+        f"2024-01-02T09:30:00.000,{size},1,187.10,0,2,1,187.20,0" for size in bid_sizes
+    ]
+    text = header + newline + newline.join(rows)
+    if rows and final_newline:
+        text += newline
+    return text.encode()
+
+
+def _job(content: bytes | None) -> Job:
+    return Job(
+        url="http://localhost/v3/stock/history/quote",
+        schema=Schema.STOCK_QUOTE,
+        csv_buffer=None if content is None else pa.py_buffer(content),
+        file_write_job=FileWriteJob(object_key="key", total_items=1),
+    )
+
+
+def _bid_sizes(job: Job) -> list[int] | None:
+    file_write_job = job.file_write_job
+    if file_write_job.skipped_items:
+        return None
+    table = pa.Table.from_batches(file_write_job.batches, schema=file_write_job.schema)
+    return table.column("bid_size").to_pylist()
+
+
+def test_mixed_batch_gives_each_job_its_own_rows():
+    contents = {
+        "crlf": _quote_csv([1, 2, 3]),
+        "crlf_more": _quote_csv([10, 11, 12, 13, 14]),
+        "no_final_newline": _quote_csv([20, 21], final_newline=False),
+        "header_only": _quote_csv([]),
+        "lf": _quote_csv([30, 31], newline="\n"),
+        "lf_more": _quote_csv([40], newline="\n", final_newline=False),
+        "quoted": _quote_csv([50, 51]).replace(b",1,187.10", b',"1",187.10'),
+        "no_data": None,
+    }
+    jobs = {name: _job(content) for name, content in contents.items()}
+
+    processor = ResponseProcessor()
+    parsed_alone: list[Job] = []
+    process = processor.process
+    processor.process = lambda job: parsed_alone.append(job) or process(job)  # type: ignore[method-assign]
+
+    results = processor.process_batch(list(jobs.values()))
+
+    assert len(results) == len(jobs)
+    # Everything but the quoted and the empty response went through a combined parse
+    assert parsed_alone == [jobs["no_data"], jobs["quoted"]]
+    assert all(job.file_write_job.completed for job in jobs.values())
+    assert _bid_sizes(jobs["crlf"]) == [1, 2, 3]
+    assert _bid_sizes(jobs["crlf_more"]) == [10, 11, 12, 13, 14]
+    assert _bid_sizes(jobs["no_final_newline"]) == [20, 21]
+    assert _bid_sizes(jobs["header_only"]) == []
+    assert _bid_sizes(jobs["lf"]) == [30, 31]
+    assert _bid_sizes(jobs["lf_more"]) == [40]
+    assert _bid_sizes(jobs["quoted"]) == [50, 51]
+    assert _bid_sizes(jobs["no_data"]) is None
+
+
+def test_blank_lines_fall_back_to_parsing_each_response():
+    with_blank = _quote_csv([10, 11]).replace(b"\r\n", b"\r\n\r\n", 1)
+    jobs = [_job(_quote_csv([1, 2])), _job(with_blank), _job(_quote_csv([20]))]
+
+    ResponseProcessor().process_batch(jobs)
+
+    assert [_bid_sizes(job) for job in jobs] == [[1, 2], [10, 11], [20]]
+
+
+def test_responses_with_different_headers_are_not_combined():
+    reordered = QUOTE_HEADER.replace("bid,bid_condition", "bid_condition,bid")
+    reordered_row = "2024-01-02T09:30:00.000,3,1,0,187.10,2,1,187.20,0"
+    jobs = [
+        _job(_quote_csv([1, 2])),
+        _job(f"{reordered}\r\n{reordered_row}\r\n".encode()),
+        _job(_quote_csv([4])),
+    ]
+
+    ResponseProcessor().process_batch(jobs)
+
+    assert [_bid_sizes(job) for job in jobs] == [[1, 2], [3], [4]]
+    reordered_table = pa.Table.from_batches(jobs[1].file_write_job.batches)
+    assert reordered_table.column("bid").to_pylist() == [187.10]
+
+
+def test_worker_takes_no_batch_past_a_large_response():
+    processor = ResponseProcessor(block_size=1024)
+    small = [_job(_quote_csv([i])) for i in range(3)]
+    large = [_job(_quote_csv(list(range(100)))) for _ in range(2)]
+    queued = [small[0], small[1], large[0], large[1], small[2]]
+    taken: list[list[Job]] = []
+    processor.process = lambda job: taken.append([job])  # type: ignore[method-assign]
+    processor.process_batch = lambda jobs: taken.append(jobs) or []  # type: ignore[method-assign]
+
+    # Run one worker loop inline: it exits on the sentinel after the last job
+    processor._running = True
+    processor.add_jobs(queued)
+    processor.input_queue.put(None)  # type: ignore[arg-type]
+    processor._work()
+
+    assert taken == [[small[0], small[1], large[0]], [large[1]], [small[2]]]
@@ -0,0 +1,63 @@
+"""Tests for extracting index tickers from Wikipedia pages."""
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from theta_client.utils import _INDEX_URLS, _parse_index_tickers, get_index_tickers
+
+_CONSTITUENTS = """
+<table class="wikitable">
+  <thead><tr><th>{column}</th><th>Security</th></tr></thead>
+  <tbody>
+    <tr><td><a href="#"> AAPL </a></td><td>Apple Inc.</td></tr>
+    <tr><td>BRK.B</td><td>Berkshire Hathaway</td></tr>
+    <tr><td>MSFT</td><td>Microsoft</td></tr>
+  </tbody>
+</table>
+"""
+
+_OTHER = "<table><tr><th>Date</th><th>Change</th></tr><tr><td>2024</td><td>+1</td></tr></table>"
+
+
+def _page(*tables: str) -> bytes:
+    return f"<html><body>{''.join(tables)}</body></html>".encode()
+
+
+def test_sp500_symbols_come_from_the_first_table():
+    page = _page(_CONSTITUENTS.format(column="Symbol"), _OTHER)
+
+    assert _parse_index_tickers("sp500", page) == ["AAPL", "BRK.B", "MSFT"]
+
+
+def test_nasdaq100_tickers_come_from_the_fifth_table():
+    page = _page(*[_OTHER] * 4, _CONSTITUENTS.format(column="Ticker"))
+
+    assert _parse_index_tickers("nasdaq100", page) == ["AAPL", "BRK.B", "MSFT"]
+
+
+def test_other_indexes_try_common_column_names():
+    page = _page(_CONSTITUENTS.format(column="Stock Symbol"))
+
+    assert _parse_index_tickers("sp600", page) == ["AAPL", "BRK.B", "MSFT"]
+
+
+def test_missing_ticker_table_raises():
+    page = _page(_OTHER)
+
+    with pytest.raises(ValueError, match="Index dow: .*'Symbol'.*table 1.*only 1 tables"):
+        _parse_index_tickers("dow", page)
+
+
+def test_missing_ticker_column_raises():
+    page = _page(_CONSTITUENTS.format(column="Company"))
+
+    with pytest.raises(ValueError, match="Index sp400: no 'Symbol' or 'Ticker'"):
+        _parse_index_tickers("sp400", page)
+
+
+def test_get_index_tickers_fetches_and_parses(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(
+        url=_INDEX_URLS["sp500"], content=_page(_CONSTITUENTS.format(column="Symbol"))
+    )
+
+    assert get_index_tickers("sp500") == ["AAPL", "BRK.B", "MSFT"]